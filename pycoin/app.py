@@ -1,15 +1,37 @@
+from contextlib import asynccontextmanager
 from uuid import uuid4
 
 from fastapi import FastAPI
 
+from pycoin.blockchain.block_utils import peer_manager, update_blockchain
 from pycoin.blockchain.blockchain_manager import BlockchainInitializer
+from pycoin.network.peer_client import close_peer_client
+from pycoin.network.propagation import close_block_propagator
 from pycoin.routers import miner, wallet
 from pycoin.settings.config import Settings
+from pycoin.signature_verifier import get_signature_verifier
 
-BlockchainInitializer()
+initializer = BlockchainInitializer()
 
 settings = Settings()
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Um nó novo baixa a cadeia dos demais antes de começar a atender
+    if initializer.is_blockchain_created:
+        await update_blockchain(initializer.block_file_path)
+    # Mantém o cache de saúde dos nós atualizado em segundo plano
+    peer_manager.start()
+    yield
+    await peer_manager.stop()
+    # Interrompe as propagações pendentes e fecha o pool de conexões com os demais nós
+    await close_block_propagator()
+    await close_peer_client()
+    get_signature_verifier().shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 node_address = str(uuid4()).replace('-', '')
 
 app.include_router(wallet.router)
@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+
+def transaction_deltas(transaction: dict) -> dict:
+    """
+    Calcula o efeito de uma transação no saldo de cada endereço envolvido.
+
+    O destinatário recebe o valor e o remetente (se diferente) perde o valor
+    mais a taxa, que é paga ao minerador pela recompensa do bloco.
+    """
+    amount = transaction.get('amount', 0)
+    fee = transaction.get('fee', 0)
+    recipient = transaction.get('recipient_address')
+    sender = transaction.get('address_sender')
+
+    deltas = {recipient: amount}
+    if sender != recipient:
+        deltas[sender] = -amount - fee
+    return deltas
+
+
+class BalanceIndex:
+    def __init__(self, index_file_path: Optional[Path] = None):
+        """
+        Índice de saldo e de referências de transações por endereço.
+
+        É atualizado incrementalmente a cada bloco aplicado e desfeito bloco a
+        bloco quando a cadeia é substituída. Cada bloco aplicado gera uma linha
+        no arquivo do índice, que é reaproveitado na próxima inicialização.
+
+        :param index_file_path: Caminho do arquivo do índice. Se None, o índice
+            fica apenas em memória.
+        """
+        self.index_file_path = index_file_path
+        self._balances = defaultdict(float)
+        # endereço -> [(altura do bloco, posição da transação no bloco)]
+        self._history = defaultdict(list)
+        # Para cada altura aplicada: hash do bloco, variações de saldo e offset no arquivo
+        self._hashes = []
+        self._deltas = []
+        self._offsets = []
+        self._lock = threading.RLock()
+
+        if index_file_path is not None and index_file_path.exists():
+            self._load_file()
+
+    def _load_file(self) -> None:
+        position = 0
+        with open(self.index_file_path, 'rb') as file:
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                entry = json.loads(line)
+                if entry['height'] != len(self._hashes):
+                    break
+                self._apply_entry(entry, position)
+                position += len(line)
+
+        if position < self.index_file_path.stat().st_size:
+            with open(self.index_file_path, 'r+b') as file:
+                file.truncate(position)
+
+    def _apply_entry(self, entry: dict, offset: int) -> None:
+        height = entry['height']
+        for address, delta in entry['deltas'].items():
+            self._balances[address] += delta
+        for address, positions in entry['refs'].items():
+            self._history[address].extend((height, position) for position in positions)
+
+        self._hashes.append(entry['hash'])
+        self._deltas.append(entry['deltas'])
+        self._offsets.append(offset)
+
+    @property
+    def height(self) -> int:
+        """
+        Altura do último bloco aplicado (-1 se o índice estiver vazio).
+        """
+        return len(self._hashes) - 1
+
+    def balance(self, address: str) -> float:
+        return self._balances.get(address, 0)
+
+    def history(self, address: str) -> list:
+        """
+        Referências (altura, posição) das transações do endereço, em ordem da cadeia.
+        """
+        with self._lock:
+            return list(self._history.get(address, []))
+
+    def history_page(self, address: str, before: Optional[tuple] = None,
+                     limit: int = 50, min_height: int = 0,
+                     max_height: Optional[int] = None) -> list:
+        """
+        Página das referências (altura, posição) do endereço, da mais recente
+        para a mais antiga.
+
+        Localiza o início da página por busca binária, então o custo não depende
+        do tamanho do histórico.
+
+        :param before: Retorna apenas referências anteriores a esta (cursor).
+        :param min_height: Menor altura de bloco incluída.
+        :param max_height: Maior altura de bloco incluída.
+        """
+        with self._lock:
+            history = self._history.get(address, [])
+            upper = len(history) if before is None \
+                else bisect_left(history, tuple(before))
+            if max_height is not None:
+                upper = min(upper, bisect_left(history, (max_height + 1,)))
+            lower = max(bisect_left(history, (min_height,)), upper - max(limit, 0))
+            return history[lower:upper][::-1]
+
+    def apply_block(self, block: dict) -> None:
+        """
+        Aplica as transações de um bloco acrescentado na ponta da cadeia.
+        """
+        with self._lock:
+            deltas = defaultdict(float)
+            refs = defaultdict(list)
+            for position, transaction in enumerate(block.get('transactions', [])):
+                for address, delta in transaction_deltas(transaction).items():
+                    deltas[address] += delta
+                    refs[address].append(position)
+
+            entry = {
+                'height': len(self._hashes),
+                'hash': block.get('hash'),
+                'deltas': deltas,
+                'refs': refs,
+            }
+
+            offset = 0
+            if self.index_file_path is not None:
+                self.index_file_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.index_file_path, 'ab') as file:
+                    offset = file.seek(0, os.SEEK_END)
+                    record = json.dumps(entry, separators=(',', ':')).encode('utf-8')
+                    file.write(record + b'\n')
+                    file.flush()
+
+            self._apply_entry(entry, offset)
+
+    def rewind(self, length: int) -> None:
+        """
+        Desfaz os blocos aplicados até restarem apenas os primeiros length.
+        """
+        with self._lock:
+            if length >= len(self._hashes):
+                return
+
+            for height in range(len(self._hashes) - 1, length - 1, -1):
+                for address, delta in self._deltas[height].items():
+                    self._balances[address] -= delta
+                    history = self._history[address]
+                    while history and history[-1][0] == height:
+                        history.pop()
+
+            if self.index_file_path is not None and self.index_file_path.exists():
+                with open(self.index_file_path, 'r+b') as file:
+                    file.truncate(self._offsets[length])
+
+            del self._hashes[length:]
+            del self._deltas[length:]
+            del self._offsets[length:]
+
+    def sync(self, chain: list) -> None:
+        """
+        Alinha o índice com a cadeia: desfaz os blocos que divergem e aplica os novos.
+
+        O custo é proporcional à divergência, não ao tamanho da cadeia.
+        """
+        with self._lock:
+            common = min(len(self._hashes), len(chain))
+            while common > 0 \
+                    and self._hashes[common - 1] != chain[common - 1].get('hash'):
+                common -= 1
+
+            self.rewind(common)
+            for block in chain[common:]:
+                self.apply_block(block)
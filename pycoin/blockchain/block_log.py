@@ -0,0 +1,191 @@
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Cada entrada do índice é o offset (8 bytes, big-endian) do registro no log
+OFFSET_FORMAT = '>Q'
+OFFSET_SIZE = struct.calcsize(OFFSET_FORMAT)
+
+
+def encode_block(block: dict) -> bytes:
+    """
+    Codifica um bloco como um registro compacto de uma linha.
+    """
+    record = json.dumps(block, separators=(',', ':'), ensure_ascii=False)
+    return record.encode('utf-8') + b'\n'
+
+
+class BlockLog:
+    def __init__(self, log_file_path: Path, index_file_path: Optional[Path] = None):
+        """
+        Armazena a blockchain em um log somente de acréscimo, com um registro
+        por bloco, e um índice de offsets que permite ler o bloco N com um único seek.
+
+        Gravar um bloco minerado escreve apenas os bytes novos. Na abertura,
+        registros incompletos deixados por uma falha durante a escrita são descartados.
+
+        :param log_file_path: Caminho do arquivo de log (um bloco por linha).
+        :param index_file_path: Caminho do índice de offsets. Por padrão usa a
+            extensão .idx ao lado do log.
+        """
+        self.path = log_file_path
+        self.index_path = index_file_path or log_file_path.with_suffix('.idx')
+        self._offsets = None
+        self._lock = threading.RLock()
+
+    def _read_offsets(self) -> list:
+        if not self.index_path.exists():
+            return []
+
+        data = self.index_path.read_bytes()
+        usable = len(data) - len(data) % OFFSET_SIZE
+        return [offset for (offset,) in struct.iter_unpack(OFFSET_FORMAT, data[:usable])]
+
+    def _write_offsets(self) -> None:
+        with open(self.index_path, 'wb') as file:
+            file.write(b''.join(struct.pack(OFFSET_FORMAT, offset)
+                                for offset in self._offsets))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _recover(self) -> None:
+        """
+        Garante que log e índice estejam consistentes após uma possível falha.
+
+        Apenas a cauda do log (a partir do último registro indexado) é verificada.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+
+        offsets = self._read_offsets()
+        log_size = self.path.stat().st_size
+        is_changed = self.index_path.exists() and \
+            self.index_path.stat().st_size != len(offsets) * OFFSET_SIZE
+
+        while offsets and offsets[-1] >= log_size:
+            offsets.pop()
+            is_changed = True
+
+        # O último registro indexado é revalidado junto com o restante da cauda
+        tail_start = offsets.pop() if offsets else 0
+        with open(self.path, 'rb') as file:
+            file.seek(tail_start)
+            position = tail_start
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                offsets.append(position)
+                position += len(line)
+
+        if position < log_size:
+            print(f'Descartando registro incompleto no final de {self.path}')
+            with open(self.path, 'r+b') as file:
+                file.truncate(position)
+            is_changed = True
+
+        self._offsets = offsets
+        if is_changed or not self.index_path.exists():
+            self._write_offsets()
+
+    def _ensure_open(self) -> list:
+        if self._offsets is None:
+            with self._lock:
+                if self._offsets is None:
+                    self._recover()
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self._ensure_open())
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def read(self, index: int) -> Optional[dict]:
+        """
+        Lê o bloco de posição index com um único seek no log.
+        """
+        with self._lock:
+            offsets = self._ensure_open()
+            if not 0 <= index < len(offsets):
+                return None
+
+            with open(self.path, 'rb') as file:
+                file.seek(offsets[index])
+                return json.loads(file.readline())
+
+    def iter_blocks(self, start: int = 0) -> Iterator[dict]:
+        """
+        Percorre os blocos a partir da posição start, lendo um registro por vez.
+        """
+        with self._lock:
+            offsets = self._ensure_open()
+            count = len(offsets) - start
+            if count <= 0:
+                return
+            first_offset = offsets[start]
+
+        with open(self.path, 'rb') as file:
+            file.seek(first_offset)
+            for _ in range(count):
+                yield json.loads(file.readline())
+
+    def load(self) -> list:
+        return list(self.iter_blocks())
+
+    def append(self, chain: list) -> None:
+        """
+        Acrescenta o último bloco da cadeia ao log. Apenas os bytes novos são escritos.
+        """
+        self.append_blocks(chain[-1:])
+
+    def append_blocks(self, blocks: list) -> None:
+        with self._lock:
+            offsets = self._ensure_open()
+            records = [encode_block(block) for block in blocks]
+
+            with open(self.path, 'ab') as file:
+                position = file.seek(0, os.SEEK_END)
+                new_offsets = []
+                for record in records:
+                    new_offsets.append(position)
+                    position += len(record)
+                file.write(b''.join(records))
+                file.flush()
+                os.fsync(file.fileno())
+
+            # O índice só é atualizado depois que os registros estão no disco
+            with open(self.index_path, 'ab') as file:
+                file.write(b''.join(struct.pack(OFFSET_FORMAT, offset)
+                                    for offset in new_offsets))
+                file.flush()
+                os.fsync(file.fileno())
+
+            offsets.extend(new_offsets)
+
+    def truncate(self, length: int) -> None:
+        """
+        Mantém apenas os primeiros length blocos.
+        """
+        with self._lock:
+            offsets = self._ensure_open()
+            if length >= len(offsets):
+                return
+
+            # O log é truncado primeiro: índices órfãos são descartados na recuperação
+            with open(self.path, 'r+b') as file:
+                file.truncate(offsets[length])
+            with open(self.index_path, 'r+b') as file:
+                file.truncate(length * OFFSET_SIZE)
+
+            del offsets[length:]
+
+    def rewrite(self, chain: list, keep: int = 0) -> None:
+        """
+        Substitui a cadeia mantendo os primeiros keep blocos já gravados.
+        """
+        with self._lock:
+            self.truncate(keep)
+            self.append_blocks(chain[keep:])
@@ -1,61 +1,97 @@
 import asyncio
 import datetime
-import hashlib
 import json
+import multiprocessing
 import random
-from http import HTTPStatus
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Optional
 from urllib.parse import urlparse
 
-import requests
-
+from pycoin.blockchain.block_log import encode_block
+from pycoin.blockchain.chain_store import ChainStore, get_chain_store
+from pycoin.blockchain.merkle import (
+    calculate_merkle_root,
+    merkle_proof,
+    merkle_root,
+    transaction_hashes,
+)
+from pycoin.mempool import get_mempool, transaction_id
+from pycoin.miner.block_template import get_block_template_builder, template_fees
+from pycoin.miner.mining_utils import (
+    chain_tip_signal,
+    get_pow_engine,
+    is_valid_proof,
+)
+from pycoin.network.peer_client import PeerClient, get_peer_client
+from pycoin.network.peer_manager import PeerManager
+from pycoin.network.propagation import get_block_propagator
+from pycoin.network.seen_cache import seen_blocks
 from pycoin.settings.config import Settings
+from pycoin.signature_verifier import get_signature_verifier
 from pycoin.transaction import Transaction
+from pycoin.utils.hashing import canonical_encode, sha256_hex
 
 settings = Settings()
 
+# Quantidade de blocos verificados entre cada consulta ao sinal de parada
+VALIDATION_STOP_CHECK_INTERVAL = 256
+
+# Estado dos workers de validação: sinal de parada compartilhado (definido no initializer)
+_validation_worker = {}
+
+
+# Cabeçalho HTTP com o hash do bloco anunciado, verificado antes de ler o corpo
+BLOCK_HASH_HEADER = 'X-Block-Hash'
+
+# Campos que compõem o cabeçalho do bloco (as transações entram pela raiz de Merkle)
+BLOCK_HEADER_FIELDS = ('index', 'timestamp', 'previous_hash', 'proof', 'merkle_root')
+
+
+def create_block(index: int, proof: int, previous_hash: str,
+                 transactions: list, timestamp: str = None) -> dict:
+    """
+    Monta um bloco calculando a raiz de Merkle das transações e o hash do cabeçalho.
+
+    O hash é calculado uma única vez e armazenado no próprio bloco.
+    """
+    block = {
+        'index': index,
+        'timestamp': timestamp or str(datetime.datetime.now()),
+        'proof': proof,
+        'previous_hash': previous_hash,
+        'merkle_root': calculate_merkle_root(transactions),
+        'transactions': transactions,
+    }
+    block['hash'] = calculate_hash(block)
+    return block
+
 
 def create_genesis_block() -> list:
     # Cria o bloco gênesis (primeiro bloco)
-    return [{
-        'index': 0,
-        'timestamp': str(datetime.datetime.now()),
-        'previous_hash': '0',
-        'hash': calculate_hash({'block_geneses': '0'}),
-        'proof': 100,
-        'transactions': [],
-    }]
+    return [create_block(index=0, proof=100, previous_hash='0', transactions=[])]
 
 
 def load_chain(block_file_path: Path = settings.BLOCKCHAIN_FILE) -> list:
     """
-    Carrega os a blockchain de um arquivo JSON. Caso o contrario gere o bloco geneses.
+    Retorna a blockchain mantida em memória pelo ChainStore.
+
+    O arquivo JSON só é lido no primeiro acesso.
     """
     if not isinstance(block_file_path, Path):
         raise ValueError("O parâmetro block_file_path deve ser um objeto do tipo Path.")
 
-    if block_file_path.exists():
-        try:
-            with open(block_file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except json.JSONDecodeError:
-            print("Erro ao carregar o arquivo chain. Retornando lista vazia.")
-        except Exception as e:
-            print(f"Error: {e}")
+    return get_chain_store(block_file_path).get_chain()
 
 
 def save_blockchain(block_file_path: Path, blockchain) -> bool:
     """
-    Salva a blockchain em um arquivo JSON.
+    Substitui a blockchain pelo ChainStore, que a salva no arquivo JSON.
     """
     if not isinstance(block_file_path, Path):
         raise ValueError("O parâmetro block_file_path deve ser um objeto do tipo Path.")
 
-    print('Salvando blockchain')
-    with open(block_file_path, 'w', encoding='utf-8') as file:
-        json.dump(blockchain, file, indent=4)
-
-    return True
+    return get_chain_store(block_file_path).replace(blockchain)
 
 
 def load_nodes(nodes_file_path: Path = settings.NODES_FILE) -> list:
@@ -96,141 +132,563 @@ def save_nodes(nodes_file_path: Path = settings.NODES_FILE,
     return True
 
 
-def check_node(node: str) -> bool:
-    """
-    Verifica se um nó está acessível via HTTP.
-    """
-    if node == settings.MY_NODE:
-        return False
-
-    try:
-        response = request_get(f'http://{node}/ping')
-        if not response:
-            print(f"O node {node} está offline")
-            return False
-
-        print(f"O node {node} está online")
-        return response.status_code == HTTPStatus.OK
-    except (requests.ConnectionError, requests.Timeout):
-        return False
-    except requests.RequestException as e:
-        print(f"Erro ao verificar nó {node}: {e}")
-        return False
-
-
-def request_get(url: str):
-    """
-    Realiza uma requisição GET e lida com possíveis erros.
-    """
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response
-    except requests.exceptions.RequestException:
-        return None
+# Cache da saúde dos nós conhecidos (a lista é relida do arquivo a cada verificação)
+peer_manager = PeerManager(load_nodes=load_nodes)
 
 
 def get_previous_block(block_file_path: str = settings.BLOCKCHAIN_FILE) -> dict:
         """
         Obtem o último bloco
         """
-        blockchain = load_chain(block_file_path)
-        return blockchain[-1]
+        return get_chain_store(block_file_path).tip()
 
 
-async def proof_of_work(previous_proof: int, difficulty: int = 4, is_sleep=True) -> int:
+async def proof_of_work(previous_proof: int, difficulty: int = 4, is_sleep=True,
+                        generation: int = None) -> int:
     """
     Gera a prova de trabalho com base na dificuldade fornecida de forma assíncrona.
 
+    A busca é feita pelo motor de mineração em um pool de processos, sem
+    bloquear o event loop.
+
     :param previous_proof: A prova do bloco anterior.
     :param difficulty: Número de zeros iniciais necessários no hash.
     :param is_sleep: Se deve simular uma pausa durante a mineração.
-    :return: O novo proof.
+    :param generation: Geração da ponta da cadeia; a busca é abortada se ela mudar.
+    :return: O novo proof ou None se a ponta da cadeia mudou.
     """
-    target = '0' * difficulty  # Define a meta baseada na dificuldade
-    new_proof = 1
-
     if is_sleep:
         # Substituímos o sleep bloqueante por await asyncio.sleep
         segundos = random.randint(2, 6)
         print(f'Esperendo por {segundos} segundos')
         await asyncio.sleep(segundos)  # Faz uma pausa de forma assíncrona
 
-    while True:
-        # Realiza o cálculo do hash
-        hash_operation = hashlib.sha256(
-            f"{new_proof**2 - previous_proof**2}".encode()
-        ).hexdigest()
+    return await get_pow_engine().search(previous_proof=previous_proof,
+                                         difficulty=difficulty,
+                                         generation=generation)
 
-        # Verifica se o hash corresponde ao alvo
-        if hash_operation[:difficulty] == target:
-            return new_proof
 
-        new_proof += 1
+def get_block_header(block: dict) -> dict:
+    """
+    Retorna o cabeçalho do bloco (tamanho constante, sem a lista de transações).
+    """
+    return {field: block.get(field) for field in BLOCK_HEADER_FIELDS}
 
 
 def calculate_hash(block: dict) -> str:
     """
-    Calcula o hash de um bloco.
+    Calcula o hash de um bloco a partir da codificação canônica do seu cabeçalho.
 
     :param block: Dicionário contendo os dados do bloco.
     :return: Hash SHA-256 do bloco.
     """
-    block_string = str(block).encode()
-    return hashlib.sha256(block_string).hexdigest()
+    return sha256_hex(canonical_encode(get_block_header(block)))
+
+
+def _is_integer(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_block_valid(previous_block: dict, block: dict, difficulty: int = 4) -> bool:
+    """
+    Verifica se um bloco é um sucessor válido do bloco anterior.
+
+    :param previous_block: Bloco anterior.
+    :param block: Bloco a ser verificado.
+    :param difficulty: Dificuldade esperada para a prova de trabalho.
+    :return: True se o encadeamento, os hashes e a prova de trabalho forem válidos.
+    """
+    # Verifica o encadeamento com o hash armazenado do bloco anterior
+    if block.get('previous_hash') != previous_block.get('hash'):
+        print("Hash da blockchain invalido!!!")
+        return False
+
+    # O índice é a altura do bloco e precisa seguir o do bloco anterior
+    header_values = (block.get('index'), block.get('proof'),
+                     previous_block.get('index'), previous_block.get('proof'))
+    if not all(_is_integer(value) for value in header_values) \
+            or block['index'] != previous_block['index'] + 1:
+        print("Cabeçalho do bloco invalido!!!")
+        return False
+
+    # A raiz de Merkle duplica o último hash de níveis ímpares, então repetir a
+    # última transação não alteraria o hash do bloco: repetições são rejeitadas
+    leaves = transaction_hashes(block.get('transactions', []))
+    if len(set(leaves)) != len(leaves):
+        print("Bloco com transações repetidas!!!")
+        return False
+
+    # Verifica se o cabeçalho compromete as transações e o próprio hash
+    if block.get('merkle_root') != merkle_root(leaves) \
+            or block.get('hash') != calculate_hash(block):
+        print("Hash do bloco invalido!!!")
+        return False
+
+    # Verifica a prova de trabalho do bloco atual
+    if not is_valid_proof(new_proof=block['proof'],
+                          previous_proof=previous_block['proof'],
+                          difficulty=difficulty):
+        print("Prova de trabalho invalida invalido!!!")
+        return False
+
+    return True
+
+
+def get_transaction_proof(block_index: int, tx_hash: str,
+                          block_file_path: Path = settings.BLOCKCHAIN_FILE) -> dict:
+    """
+    Gera a prova de inclusão de uma transação em um bloco.
+
+    Com o cabeçalho e a prova, um cliente leve verifica a inclusão sem baixar
+    as demais transações do bloco.
+
+    :return: Dicionário com o cabeçalho, o hash do bloco e a prova, ou None se o
+        bloco ou a transação não forem encontrados.
+    """
+    if block_index < 0:
+        return None
+
+    block = get_chain_store(block_file_path).get_block(block_index)
+    if block is None:
+        return None
+
+    leaves = transaction_hashes(block.get('transactions', []))
+    if tx_hash not in leaves:
+        return None
+
+    return {
+        'block_hash': block['hash'],
+        'header': get_block_header(block),
+        'transaction_hash': tx_hash,
+        'proof': merkle_proof(leaves, leaves.index(tx_hash)),
+    }
+
+
+def _init_validation_worker(stop_event) -> None:
+    _validation_worker['stop_event'] = stop_event
+
+
+def _validate_chain_segment(segment: list, difficulty: int) -> bool:
+    """
+    Valida um trecho da cadeia dentro de um worker do pool.
+
+    O primeiro bloco do trecho é o antecessor do primeiro bloco verificado. Ao
+    encontrar uma falha, os demais workers são sinalizados para parar.
+    """
+    stop_event = _validation_worker.get('stop_event')
+    for index in range(1, len(segment)):
+        if index % VALIDATION_STOP_CHECK_INTERVAL == 0 \
+                and stop_event is not None and stop_event.is_set():
+            return False
+
+        if not is_block_valid(segment[index - 1], segment[index], difficulty=difficulty):
+            if stop_event is not None:
+                stop_event.set()
+            return False
 
+    return True
+
+
+def _is_chain_valid_parallel(chain: list, difficulty: int,
+                             start_index: int, workers: int) -> bool:
+    """
+    Divide a verificação em trechos distribuídos entre um pool de processos.
 
-def is_chain_valid(chain: list, difficulty: int = 4) -> bool:
+    Cada bloco depende apenas do seu antecessor, então os trechos são independentes.
+    """
+    stop_event = multiprocessing.Event()
+    total_blocks = len(chain) - start_index
+    chunk_size = max(1, -(-total_blocks // (workers * 4)))
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_validation_worker,
+                             initargs=(stop_event,)) as executor:
+        futures = [
+            executor.submit(_validate_chain_segment,
+                            chain[start - 1:start + chunk_size], difficulty)
+            for start in range(start_index, len(chain), chunk_size)
+        ]
+
+        for future in as_completed(futures):
+            if not future.result():
+                stop_event.set()
+                for pending in futures:
+                    pending.cancel()
+                return False
+
+    return True
+
+
+def is_chain_valid(chain: list, difficulty: int = 4, start_index: int = 1,
+                   workers: int = 1) -> bool:
     """
     Verifica a validade de uma blockchain.
 
     :param chain: Lista de blocos representando a blockchain.
     :param difficulty: Dificuldade esperada para a prova de trabalho.
+    :param start_index: Primeiro bloco a ser verificado. Os blocos anteriores são
+        considerados já validados.
+    :param workers: Quantidade de processos usados. A verificação só é feita em
+        paralelo quando há ao menos PARALLEL_VALIDATION_MIN_BLOCKS blocos a verificar.
     :return: True se a blockchain for válida, False caso contrário.
     """
-    for index in range(1, len(chain)):
-        previous_block = chain[index - 1]
-        current_block = chain[index]
+    start_index = max(start_index, 1)
+
+    is_large = len(chain) - start_index >= settings.PARALLEL_VALIDATION_MIN_BLOCKS
+    if workers > 1 and is_large:
+        return _is_chain_valid_parallel(chain, difficulty=difficulty,
+                                        start_index=start_index, workers=workers)
 
-        # Verifica o hash do bloco anterior
-        if current_block['hash'] != calculate_hash(previous_block):
-            print("Hash da blockchain invalido!!!")
+    for index in range(start_index, len(chain)):
+        if not is_block_valid(chain[index - 1], chain[index], difficulty=difficulty):
             return False
 
-        # Verifica a prova de trabalho do bloco atual
-        previous_proof = previous_block['proof']
-        current_proof = current_block['proof']
-        hash_operation = hashlib.sha256(
-            f"{current_proof**2 - previous_proof**2}".encode()
-        ).hexdigest()
-        if hash_operation[:difficulty] != '0' * difficulty:
-            print("Prova de trabalho invalida invalido!!!")
+    return True
+
+
+def are_block_signatures_valid(blocks: list) -> bool:
+    """
+    Verifica em lote as assinaturas de todas as transações dos blocos.
+    """
+    transactions = [transaction for block in blocks
+                    for transaction in block.get('transactions', [])]
+    return get_signature_verifier().verify_many(transactions)
+
+
+def find_fork_point(local_chain: list, chain: list) -> int:
+    """
+    Encontra a quantidade de blocos iniciais em comum entre duas cadeias.
+
+    Usa busca binária, comparando os hashes armazenados de O(log n) blocos.
+    """
+    low, high = 0, min(len(local_chain), len(chain))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if local_chain[middle - 1].get('hash') == chain[middle - 1].get('hash'):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def validate_local_chain(block_file_path: Path = settings.BLOCKCHAIN_FILE,
+                         difficulty: int = 4, is_full: bool = False) -> bool:
+    """
+    Valida a cadeia local a partir do último checkpoint validado.
+
+    Apenas os blocos acrescentados desde a última validação são verificados.
+
+    :param is_full: Revalida a cadeia inteira desde o gênesis (auditoria).
+    """
+    chain_store = get_chain_store(block_file_path)
+    chain = chain_store.get_chain()
+    if not chain:
+        return False
+
+    start_index = 1 if is_full else chain_store.validated_height + 1
+    if not is_chain_valid(chain, difficulty=difficulty, start_index=start_index,
+                          workers=settings.VALIDATION_WORKERS):
+        return False
+
+    chain_store.mark_validated(len(chain) - 1, chain[-1])
+    return True
+
+
+def validate_candidate_chain(chain: list,
+                             block_file_path: Path = settings.BLOCKCHAIN_FILE,
+                             difficulty: int = 4) -> list:
+    """
+    Valida uma cadeia recebida de outro nó reaproveitando o prefixo já validado.
+
+    Somente os blocos a partir do ponto de bifurcação com a cadeia local (ou do
+    checkpoint, se ele for anterior) são verificados.
+
+    :return: A cadeia a ser adotada (prefixo local + sufixo recebido) ou None se inválida.
+    """
+    chain_store = get_chain_store(block_file_path)
+    local_chain = chain_store.get_chain()
+
+    fork_point = find_fork_point(local_chain, chain)
+    start_index = min(fork_point, chain_store.validated_height + 1)
+
+    if not is_chain_valid(chain, difficulty=difficulty, start_index=start_index,
+                          workers=settings.VALIDATION_WORKERS):
+        return None
+
+    return local_chain[:fork_point] + chain[fork_point:]
+
+
+def get_chain_tip(block_file_path: Path = settings.BLOCKCHAIN_FILE) -> dict:
+    """
+    Retorna a altura e o hash da ponta da cadeia local.
+    """
+    tip = get_chain_store(block_file_path).tip()
+    if tip is None:
+        return {'height': -1, 'hash': None}
+    return {'height': tip['index'], 'hash': tip.get('hash')}
+
+
+def get_block_headers(from_height: int, limit: int = settings.SYNC_PAGE_SIZE,
+                      block_file_path: Path = settings.BLOCKCHAIN_FILE) -> list:
+    """
+    Retorna os cabeçalhos (com o hash) dos blocos a partir de from_height.
+
+    :param limit: Quantidade de cabeçalhos, limitada a SYNC_PAGE_SIZE.
+    """
+    return [{**get_block_header(block), 'hash': block.get('hash')}
+            for block in get_blocks_page(from_height, limit, block_file_path)]
+
+
+def get_blocks_page(from_height: int, limit: int = settings.SYNC_PAGE_SIZE,
+                    block_file_path: Path = settings.BLOCKCHAIN_FILE) -> list:
+    """
+    Retorna os blocos completos a partir de from_height.
+
+    :param limit: Quantidade de blocos, limitada a SYNC_PAGE_SIZE.
+    """
+    limit = max(0, min(limit, settings.SYNC_PAGE_SIZE))
+    from_height = max(from_height, 0)
+    return get_chain_store(block_file_path).get_blocks(from_height, from_height + limit)
+
+
+def get_chain_page(from_height: int = 0, limit: Optional[int] = None,
+                   block_file_path: Path = settings.BLOCKCHAIN_FILE) -> list:
+    """
+    Retorna os blocos a partir de from_height.
+
+    :param limit: Quantidade de blocos, limitada a SYNC_PAGE_SIZE. Se None,
+        retorna todos os blocos restantes.
+    """
+    if limit is None:
+        return get_chain_store(block_file_path).get_blocks(from_height)
+    return get_blocks_page(from_height, limit, block_file_path)
+
+
+def iter_chain_ndjson(from_height: int = 0, limit: Optional[int] = None,
+                      block_file_path: Path = settings.BLOCKCHAIN_FILE):
+    """
+    Gera os blocos a partir de from_height no formato NDJSON, um bloco por linha.
+
+    Apenas um bloco é codificado por vez, então a memória usada não depende do
+    tamanho da cadeia.
+
+    :param limit: Quantidade máxima de blocos. Se None, até a ponta da cadeia.
+    """
+    from_height = max(from_height, 0)
+    stop = None if limit is None else from_height + max(limit, 0)
+    for block in get_chain_store(block_file_path).get_blocks(from_height, stop):
+        yield encode_block(block)
+
+
+async def _get_peer_json(client: PeerClient, node: str, path: str, **params) -> dict:
+    response = await client.get(node, path, params=params)
+    if response is None:
+        raise ConnectionError(f'O nó {node} não respondeu a {path}')
+    return response.json()
+
+
+async def fetch_peer_tip(node: str, client: Optional[PeerClient] = None) -> dict:
+    """
+    Consulta a altura e o hash da ponta da cadeia de outro nó.
+    """
+    return await _get_peer_json(client or get_peer_client(), node, '/miner/tip')
+
+
+async def _fetch_peer_hash(client: PeerClient, node: str, height: int) -> Optional[str]:
+    data = await _get_peer_json(client, node, '/miner/headers',
+                                from_height=height, limit=1)
+    headers = data.get('headers', [])
+    return headers[0].get('hash') if headers else None
+
+
+async def find_common_ancestor(node: str, local_chain: list, peer_height: int,
+                               client: Optional[PeerClient] = None) -> int:
+    """
+    Encontra a quantidade de blocos iniciais em comum com a cadeia de outro nó.
+
+    Consulta primeiro a ponta local (caso comum: o nó apenas está à frente) e,
+    havendo bifurcação, faz uma busca binária pedindo O(log n) cabeçalhos.
+    """
+    client = client or get_peer_client()
+    low, high = 0, min(len(local_chain), peer_height + 1)
+
+    if high and await _fetch_peer_hash(client, node, high - 1) \
+            == local_chain[high - 1].get('hash'):
+        return high
+    high = max(high - 1, 0)
+
+    while low < high:
+        middle = (low + high + 1) // 2
+        if await _fetch_peer_hash(client, node, middle - 1) \
+                == local_chain[middle - 1].get('hash'):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+async def fetch_peer_blocks(node: str, from_height: int, to_height: int,
+                            client: Optional[PeerClient] = None) -> list:
+    """
+    Baixa os blocos [from_height, to_height) de outro nó, em páginas paralelas.
+    """
+    client = client or get_peer_client()
+    pages = await asyncio.gather(*(
+        _get_peer_json(client, node, '/miner/blocks', from_height=start,
+                       limit=min(settings.SYNC_PAGE_SIZE, to_height - start))
+        for start in range(from_height, to_height, settings.SYNC_PAGE_SIZE)))
+
+    blocks = [block for page in pages for block in page.get('blocks', [])]
+    if [block.get('index') for block in blocks] != list(range(from_height, to_height)):
+        raise ValueError(f'O nó {node} retornou blocos fora da sequência esperada')
+    return blocks
+
+
+async def sync_from_peer(node: str, block_file_path: Path = settings.BLOCKCHAIN_FILE,
+                         difficulty: int = 4, peer_tip: Optional[dict] = None,
+                         client: Optional[PeerClient] = None) -> bool:
+    """
+    Sincroniza a cadeia local com a de outro nó baixando apenas o que falta.
+
+    O ancestral comum é localizado pelos cabeçalhos e só o sufixo divergente é
+    baixado e validado. Sem nenhum bloco em comum a cadeia inteira é baixada
+    em páginas e validada em paralelo.
+
+    :param peer_tip: Ponta do nó, se já consultada.
+    :return: True se a cadeia local foi substituída.
+    """
+    client = client or get_peer_client()
+    chain_store = get_chain_store(block_file_path)
+
+    try:
+        peer_tip = peer_tip or await fetch_peer_tip(node, client=client)
+        local_chain = chain_store.get_chain()
+        peer_length = peer_tip['height'] + 1
+        if peer_length <= len(local_chain):
             return False
 
+        fork_point = await find_common_ancestor(node, local_chain, peer_tip['height'],
+                                                client=client)
+        blocks = await fetch_peer_blocks(node, fork_point, peer_length, client=client)
+    except (ConnectionError, ValueError, KeyError) as e:
+        print(f'Erro ao sincronizar com o nó {node}: {e}')
+        return False
+
+    print(f'Sincronizando {len(blocks)} blocos do nó {node} '
+          f'a partir da altura {fork_point}')
+    if not await asyncio.to_thread(are_block_signatures_valid, blocks):
+        print(f'O nó {node} enviou transações com assinatura inválida')
+        return False
+
+    valid_chain = await asyncio.to_thread(
+        validate_candidate_chain, local_chain[:fork_point] + blocks,
+        block_file_path=block_file_path, difficulty=difficulty)
+    if not valid_chain or len(valid_chain) <= len(chain_store):
+        return False
+
+    chain_store.replace(valid_chain, is_validated=True)
+    discard_mined_transactions(blocks)
     return True
 
 
-def propagate_new_blockchain(chain,
-                            nodes,
-                            nodes_updated: list = settings.LIST_NODE_VALID,
-                            my_node: str = settings.NODES_FILE):
-    for node in nodes:
-        if not check_node(node) or node == my_node:
-            continue
+def discard_mined_transactions(
+        blocks: list, transactions_file_path: Path = settings.TRANSACTIONS_FILE) -> int:
+    """
+    Remove do mempool as transações incluídas em blocos aceitos de outros nós.
 
-        print(f'Verificando propagação: {my_node} ---> {node}')
+    O id é sempre recalculado a partir do conteúdo: o campo id enviado pelo nó
+    não é confiável e poderia remover uma transação pendente que não foi minerada.
+
+    :return: Quantidade de transações removidas.
+    """
+    tx_ids = [transaction_id(transaction)
+              for block in blocks for transaction in block.get('transactions', [])]
+    return get_mempool(transactions_file_path).remove(tx_ids)
 
-        try:
-            url = f'http://{node}/miner/new_blockchain'
-            print(f'Propagação de blocos: {my_node} ---> {node}')
-            response = requests.post(url,
-                json={'chain': chain, 'nodes_updated': nodes_updated})
-            if response.status_code == HTTPStatus.OK:
-                print(f'Sucesso ao notificar {node}')
-            else:
-                print(f'Erro ao notificar {node}: {response.status_code}')
-        except Exception as e:
-            print(f'Erro ao conectar com {node}: {str(e)}')
+
+def propagate_new_block(block: dict,
+                        nodes: list,
+                        my_node: str = settings.MY_NODE,
+                        exclude: tuple = ()) -> None:
+    """
+    Anuncia um único bloco aos demais nós, sem aguardar as entregas.
+
+    O anúncio tem tamanho constante; quem estiver atrasado busca os blocos que
+    faltam no nó que enviou o anúncio.
+
+    :param exclude: Nós que não devem receber o anúncio (ex.: quem o enviou).
+    """
+    # O próprio nó descarta o anúncio caso ele volte por outro caminho
+    seen_blocks.add(block['hash'])
+    get_block_propagator().announce(
+        path='/miner/new_block',
+        payload={'block': block, 'sender': my_node},
+        nodes=[node for node in nodes if node != my_node and node not in exclude],
+        headers={BLOCK_HASH_HEADER: block['hash']},
+    )
+
+
+async def _append_announced_block(chain_store: ChainStore, tip: dict, block: dict,
+                                  sender: str, difficulty: int) -> str:
+    """
+    Valida e acrescenta um bloco anunciado que se encaixa na ponta local.
+
+    :return: 'accepted', 'ignored' ou 'invalid'.
+    """
+    if not is_block_valid(tip, block, difficulty=difficulty) \
+            or not await asyncio.to_thread(are_block_signatures_valid, [block]):
+        return 'invalid'
+
+    is_checkpoint = chain_store.validated_height == tip['index']
+    if not chain_store.append_block(block):
+        return 'ignored'
+    if is_checkpoint:
+        chain_store.mark_validated(block['index'], block)
+    discard_mined_transactions([block])
+
+    propagate_new_block(block, peer_manager.live_peers(), exclude=(sender,))
+    return 'accepted'
+
+
+async def receive_new_block(block: dict, sender: str,
+                            block_file_path: Path = settings.BLOCKCHAIN_FILE,
+                            difficulty: int = 4) -> str:
+    """
+    Processa o anúncio de um bloco recebido de outro nó.
+
+    Um bloco que se encaixa na ponta local é validado isoladamente e acrescentado.
+    Se houver blocos faltando entre a ponta local e o anunciado, a cadeia é
+    sincronizada a partir de quem enviou o anúncio, desde que seja um nó conhecido.
+
+    :return: 'accepted', 'synced', 'known', 'ignored' ou 'invalid'.
+    """
+    chain_store = get_chain_store(block_file_path)
+    index = block.get('index')
+    if not isinstance(index, int) or index < 0:
+        return 'invalid'
+
+    known_block = chain_store.get_block(index)
+    if known_block is not None and known_block.get('hash') == block.get('hash'):
+        return 'known'
+
+    tip = chain_store.tip()
+    tip_index = tip['index'] if tip else -1
+    if index <= tip_index:
+        # A cadeia anunciada não é mais longa que a local
+        return 'ignored'
+
+    if tip and index == tip_index + 1 and block.get('previous_hash') == tip.get('hash'):
+        return await _append_announced_block(chain_store, tip, block, sender, difficulty)
+
+    # Faltam blocos (ou a ponta local foi superada por uma bifurcação). O nó
+    # que enviou o anúncio só é consultado se estiver entre os nós conhecidos
+    if not peer_manager.is_known(sender) \
+            or not await sync_from_peer(sender, block_file_path=block_file_path,
+                                        difficulty=difficulty):
+        return 'ignored'
+
+    propagate_new_block(chain_store.tip(), peer_manager.live_peers(), exclude=(sender,))
+    return 'synced'
 
 
 def add_node(possible_new_nodes: list) -> None:
@@ -243,10 +701,14 @@ def add_node(possible_new_nodes: list) -> None:
     save_nodes(list_nodes=nodes)
 
 
-def update_blockchain(block_file_path: Path = settings.BLOCKCHAIN_FILE) -> bool:
+async def update_blockchain(block_file_path: Path = settings.BLOCKCHAIN_FILE,
+                            difficulty: int = 4) -> bool:
     """
     Atualiza a blockchain local pela cadeia mais longa da rede, se encontrada.
     Também garante que a rede esteja conectada e que os novos nós sejam integrados.
+
+    Apenas a ponta de cada nó é consultada; os blocos são baixados somente do
+    nó com a cadeia mais longa, a partir do ancestral comum.
     """
     nodes = load_nodes()
 
@@ -254,36 +716,32 @@ def update_blockchain(block_file_path: Path = settings.BLOCKCHAIN_FILE) -> bool:
         print('Nenhum nó disponível na rede para sincronização.')
         return False
 
-    longest_chain = None
-    chain = load_chain(block_file_path)
-    max_length = len(chain)
+    # Apenas os nós com verificação vencida são pingados; os demais vêm do cache
+    await peer_manager.refresh()
+    responses = await get_peer_client().get_many(peer_manager.live_peers(), '/miner/tip')
 
-    for node in nodes:
-        if not check_node(node):
+    tips = {}
+    for node, response in responses.items():
+        if response is None:
+            print(f"O node {node} está offline")
+            peer_manager.record_failure(node)
             continue
-
         try:
-            response = request_get(f'http://{node}/miner/get_chain')
-            if response.status_code == HTTPStatus.OK:
-                node_data = response.json()
-                length = node_data.get('length')
-                chain = node_data.get('chain')
-
-                # Verifica se a cadeia recebida é válida e maior
-                if length > max_length and is_chain_valid(chain):
-                    max_length = length
-                    longest_chain = chain
-
-        except Exception as e:
-            print(f'Erro ao conectar-se ao nó {node}: {e}')
-
-    # Substitui a cadeia se uma mais longa for encontrada
-    if longest_chain:
-        chain = longest_chain
-        save_blockchain(blockchain=chain,
-            block_file_path=block_file_path)
-        print('A cadeia foi substituída pela mais longa disponível.')
-        return True
+            tips[node] = response.json()
+        except ValueError as e:
+            print(f'Erro ao processar a ponta do nó {node}: {e}')
+
+    # Tenta os nós com a cadeia mais longa primeiro
+    local_length = len(get_chain_store(block_file_path))
+    candidates = sorted(
+        (node for node, tip in tips.items() if tip.get('height', -1) >= local_length),
+        key=lambda node: tips[node]['height'], reverse=True)
+
+    for node in candidates:
+        if await sync_from_peer(node, block_file_path=block_file_path,
+                                difficulty=difficulty, peer_tip=tips[node]):
+            print('A cadeia foi substituída pela mais longa disponível.')
+            return True
 
     print('A cadeia local já é a mais longa ou nenhuma válida foi encontrada.')
     return False
@@ -296,42 +754,66 @@ async def start_block_mining(block_file_path: Path = settings.BLOCKCHAIN_FILE,
     # TODO: Verifica se não há blocos já minerados
 
     try:
-        previous_block = get_previous_block(block_file_path=block_file_path)
+        chain_store = get_chain_store(block_file_path)
+        generation = chain_tip_signal.generation
+        previous_block = chain_store.tip()
+
+        proof = await proof_of_work(previous_proof=previous_block['proof'],
+                                    generation=generation)
+        if proof is None:
+            print('Mineração abortada: a ponta da cadeia mudou.')
+            return False
 
-        proof = await proof_of_work(previous_proof=previous_block['proof'])
+        chain = chain_store.get_chain()
 
-        chain = load_chain(block_file_path=block_file_path)
+        if chain[-1]['hash'] != previous_block['hash']:
+            # Outro bloco foi aceito enquanto o proof era calculado
+            print('Bloco descartado: a ponta da cadeia mudou.')
+            return False
 
-        is_valid = is_chain_valid(chain)
+        # Após reiniciar o checkpoint é perdido e a validação percorre a cadeia
+        # inteira; ela roda fora do event loop para não travar as requisições
+        is_valid = await asyncio.to_thread(validate_local_chain,
+                                           block_file_path=block_file_path)
         if not is_valid:
             # Se o bloco não for valido deve-se atualizar o bloco
-            update_blockchain()
+            await update_blockchain(block_file_path=block_file_path)
             return False
 
-        Transaction.add_transaction_miner_reward(
-            miner_address=settings.MINER_PUBLIC_ADDRESS,
-            reward_amount=settings.MINING_REWARD)
-
-        block = {
-            'index': len(chain),
-            'timestamp': str(datetime.datetime.now()),
-            'proof': proof,
-            'hash': calculate_hash(previous_block),
-            'previous_hash': previous_block['hash'],
-            'transactions': Transaction.load_transactions(transactions_file_path=transactions_file_path),
-        }
-        Transaction.clear_transactions(transactions_file_path=transactions_file_path)
+        # Transações priorizadas por taxa dentro dos limites do bloco. Ficam
+        # reservadas no mempool até o bloco ser aceito; se algo falhar a
+        # reserva é desfeita ao sair do bloco with
+        template = get_block_template_builder(
+            block_file_path=block_file_path,
+            transactions_file_path=transactions_file_path).get_template()
+        with get_mempool(transactions_file_path).take_snapshot(
+                transaction['id'] for transaction in template) as snapshot:
+            # A recompensa (com as taxas) é criada no próprio bloco
+            fees = template_fees(snapshot.transactions)
+            reward = Transaction.create_miner_reward(
+                miner_address=settings.MINER_PUBLIC_ADDRESS,
+                reward_amount=settings.MINING_REWARD + fees)
+
+            block = create_block(
+                index=len(chain),
+                proof=proof,
+                previous_hash=previous_block['hash'],
+                transactions=snapshot.transactions + [reward],
+            )
+
+            if not chain_store.append_block(block):
+                print('Bloco descartado: a ponta da cadeia mudou.')
+                return False
+
+            # Apenas as transações incluídas saem do mempool
+            snapshot.commit()
 
         print(f'O node {settings.NODES_FILE} conseguiu minerar um bloco!!!')
-        chain.append(block)
 
-        save_blockchain(block_file_path=block_file_path,
-                        blockchain=chain)
-
-        # Se comunica com os demais nós dá rede
-        nodes = load_nodes()
-        propagate_new_blockchain(
-            chain=chain,
+        # Anuncia apenas o novo bloco aos demais nós dá rede
+        nodes = peer_manager.live_peers()
+        propagate_new_block(
+            block=block,
             nodes=nodes,
         )
 
@@ -343,12 +825,22 @@ async def start_block_mining(block_file_path: Path = settings.BLOCKCHAIN_FILE,
         return None
 
 
-def check_progagate_blockchain(new_blockchain,
-                               nodes_updated: list,
-                               block_file_path: Path = settings.BLOCKCHAIN_FILE,):
+async def check_progagate_blockchain(new_blockchain,
+                                     nodes_updated: list,
+                                     block_file_path: Path = settings.BLOCKCHAIN_FILE,):
     """
     Verifica se o bloco propagado é o mais maior
     """
+    # Cadeia cuja ponta já foi processada. O hash só é lembrado quando a cadeia
+    # é aceita (ao propagar a nova ponta); nodes_updated não é usado porque nós
+    # antigos enviam a lista de nós válidos, que inclui o próprio receptor
+    if new_blockchain and new_blockchain[-1].get('hash') in seen_blocks:
+        response = {
+            'message': 'A cadeia já foi processada por este nó.',
+            'new_blockchain': [],
+            'nodes_updated': [],
+        }
+        return response
 
     chain = load_chain(block_file_path)
 
@@ -358,24 +850,26 @@ def check_progagate_blockchain(new_blockchain,
     length = len(new_blockchain)
     blockchain = new_blockchain
 
-    # Verifica se a cadeia recebida é válida e maior
-    if length > max_length and is_chain_valid(blockchain):
-        max_length = length
-        longest_blockchain = blockchain
+    # Verifica se a cadeia recebida é maior e válida
+    fork_point = find_fork_point(chain, blockchain)
+    if length > max_length and await asyncio.to_thread(
+            are_block_signatures_valid, blockchain[fork_point:]):
+        longest_blockchain = await asyncio.to_thread(
+            validate_candidate_chain, blockchain, block_file_path=block_file_path)
 
     # Substitui a cadeia se uma mais longa for encontrada
     if longest_blockchain:
         chain = longest_blockchain
-        save_blockchain(blockchain=chain,
-                        block_file_path=settings.BLOCKCHAIN_FILE)
+        get_chain_store(block_file_path).replace(chain, is_validated=True)
+        discard_mined_transactions(chain[fork_point:])
 
-        if settings.NODES_FILE not in nodes_updated:
-            nodes_updated.append(settings.NODES_FILE)
+        if settings.MY_NODE not in nodes_updated:
+            nodes_updated.append(settings.MY_NODE)
 
-        # Continua a propagação
-        nodes = load_nodes()
-        propagate_new_blockchain(
-            chain=chain, nodes=nodes
+        # Continua a propagação anunciando apenas a nova ponta
+        nodes = peer_manager.live_peers()
+        propagate_new_block(
+            block=chain[-1], nodes=nodes
         )
 
         print('A cadeia foi substituída pela mais longa disponível.')
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+from pycoin.blockchain.chain_store import get_chain_store
 from pycoin.settings.config import Settings
 from pycoin.utils.file_initializers import (
     initialize_blockchain_file,
@@ -21,6 +22,10 @@ class BlockchainInitializer:
             # Se o json estiver corrompido criar outro zerado
 
         # Inicialização dos arquivos
+        self.block_file_path = block_file_path
+        # Uma blockchain recém-criada deve ser sincronizada com os demais nós
+        # assim que o event loop estiver rodando (no lifespan da aplicação)
+        self.is_blockchain_created = not get_chain_store(block_file_path).storage.exists()
         initialize_node_file(nodes_file_path=nodes_file_path)
         initialize_blockchain_file(block_file_path=block_file_path)
         initialize_transaction_file(transaction_file_path=transaction_file_path)
@@ -0,0 +1,273 @@
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Optional
+
+from pycoin.blockchain.balance_index import BalanceIndex
+from pycoin.blockchain.block_log import BlockLog
+from pycoin.miner.mining_utils import chain_tip_signal
+from pycoin.settings.config import Settings
+
+settings = Settings()
+
+
+class JsonBlockStorage:
+    def __init__(self, block_file_path: Path):
+        """
+        Armazena a blockchain inteira em um único arquivo JSON.
+
+        Toda escrita regrava o arquivo completo.
+        """
+        self.path = block_file_path
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> list:
+        if not self.path.exists():
+            return []
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except json.JSONDecodeError:
+            print("Erro ao carregar o arquivo chain. Retornando lista vazia.")
+        except Exception as e:
+            print(f"Error: {e}")
+
+        return []
+
+    def rewrite(self, chain: list, keep: int = 0) -> None:
+        print('Salvando blockchain')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump(chain, file, indent=4)
+
+    def append(self, chain: list) -> None:
+        self.rewrite(chain)
+
+
+def migrate_json_to_block_log(block_file_path: Path, block_log: BlockLog) -> int:
+    """
+    Converte um arquivo block.json para o formato de log somente de acréscimo.
+
+    :return: Quantidade de blocos migrados.
+    """
+    chain = JsonBlockStorage(block_file_path).load()
+    block_log.rewrite(chain, keep=0)
+    print(f'{len(chain)} blocos migrados de {block_file_path} para {block_log.path}')
+    return len(chain)
+
+
+def create_block_storage(block_file_path: Path,
+                         storage_type: str = settings.BLOCKCHAIN_STORAGE):
+    """
+    Cria o armazenamento configurado para a blockchain.
+
+    No formato "log" os arquivos ficam ao lado do JSON (.log e .idx). Se o log
+    ainda não existir, o conteúdo do JSON é migrado automaticamente.
+    """
+    if storage_type == 'json':
+        return JsonBlockStorage(block_file_path)
+
+    if storage_type == 'log':
+        block_log = BlockLog(block_file_path.with_suffix('.log'))
+        if not block_log.exists() and block_file_path.exists() \
+                and block_file_path.stat().st_size:
+            migrate_json_to_block_log(block_file_path, block_log)
+        return block_log
+
+    raise ValueError(f"Tipo de armazenamento da blockchain desconhecido: {storage_type}")
+
+
+class ChainStore:
+    def __init__(self, block_file_path: Path, storage=None,
+                 balance_index: Optional[BalanceIndex] = None):
+        """
+        Mantém a blockchain em memória e é o único responsável por escrevê-la no disco.
+
+        O arquivo é lido uma única vez (no primeiro acesso); as leituras seguintes
+        são servidas da memória e toda escrita passa por esta classe, mantendo
+        memória e disco sincronizados.
+
+        :param block_file_path: Caminho do arquivo JSON da blockchain.
+        :param storage: Armazenamento usado (JsonBlockStorage ou BlockLog). Por
+            padrão segue a configuração BLOCKCHAIN_STORAGE.
+        :param balance_index: Índice de saldos por endereço mantido junto com a
+            cadeia. Por padrão é persistido ao lado do arquivo (.balances).
+        """
+        self.block_file_path = block_file_path
+        self.storage = storage if storage is not None \
+            else create_block_storage(block_file_path)
+        self.balance_index = balance_index if balance_index is not None \
+            else BalanceIndex(block_file_path.with_suffix('.balances'))
+        self._chain = None
+        self._lock = threading.RLock()
+        # Altura até a qual a cadeia local já foi validada (o gênesis não é validado)
+        self._validated_height = 0
+
+    def _ensure_loaded(self) -> list:
+        if self._chain is None:
+            with self._lock:
+                if self._chain is None:
+                    self._chain = self.storage.load()
+                    self.balance_index.sync(self._chain)
+        return self._chain
+
+    def _common_prefix_length(self, chain: list) -> int:
+        current = self._chain or []
+        for index, (current_block, block) in enumerate(zip(current, chain)):
+            if current_block.get('hash') != block.get('hash'):
+                return index
+        return min(len(current), len(chain))
+
+    def reload(self) -> None:
+        """
+        Descarta a cópia em memória e relê o arquivo no próximo acesso.
+        """
+        with self._lock:
+            self._chain = None
+            self._validated_height = 0
+
+    @property
+    def validated_height(self) -> int:
+        return self._validated_height
+
+    @property
+    def validated_hash(self) -> Optional[str]:
+        """
+        Hash do bloco na altura validada (checkpoint).
+        """
+        with self._lock:
+            chain = self._ensure_loaded()
+            if not chain:
+                return None
+            return chain[min(self._validated_height, len(chain) - 1)].get('hash')
+
+    def mark_validated(self, height: int, block: dict) -> bool:
+        """
+        Avança o checkpoint de validação até height.
+
+        O bloco informado deve ser o mesmo objeto presente nessa altura; se a
+        cadeia foi substituída durante a validação o checkpoint não é alterado.
+        """
+        with self._lock:
+            chain = self._ensure_loaded()
+            if not 0 <= height < len(chain) or chain[height] is not block:
+                return False
+
+            self._validated_height = max(self._validated_height, height)
+            return True
+
+    def get_chain(self) -> list:
+        """
+        Retorna uma cópia rasa da blockchain (os blocos não devem ser alterados).
+        """
+        with self._lock:
+            return list(self._ensure_loaded())
+
+    def get_block(self, index: int) -> Optional[dict]:
+        with self._lock:
+            chain = self._ensure_loaded()
+            if -len(chain) <= index < len(chain):
+                return chain[index]
+            return None
+
+    def get_blocks(self, start: int, stop: Optional[int] = None) -> list:
+        """
+        Retorna os blocos das posições [start, stop).
+        """
+        with self._lock:
+            return self._ensure_loaded()[max(start, 0):stop]
+
+    def count_blocks_before(self, timestamp: str, inclusive: bool = False) -> int:
+        """
+        Quantidade de blocos com timestamp anterior ao informado (busca binária).
+
+        Considera que os timestamps dos blocos são crescentes ao longo da cadeia.
+
+        :param inclusive: Conta também os blocos com timestamp igual ao informado.
+        """
+        search = bisect_right if inclusive else bisect_left
+        with self._lock:
+            return search(self._ensure_loaded(), timestamp,
+                          key=lambda block: block.get('timestamp', ''))
+
+    def tip(self) -> Optional[dict]:
+        """
+        Retorna o último bloco da cadeia.
+        """
+        return self.get_block(-1)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ensure_loaded())
+
+    def replace(self, chain: list, is_validated: bool = False) -> bool:
+        """
+        Substitui a cadeia inteira e persiste no disco.
+
+        Se a ponta da cadeia mudar, a mineração em andamento é sinalizada.
+
+        :param is_validated: Indica que a nova cadeia já foi validada por completo.
+            Caso contrário o checkpoint recua para o prefixo em comum.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            previous_tip = self._chain[-1] if self._chain else None
+            keep = self._common_prefix_length(chain)
+            self._chain = list(chain)
+            self.storage.rewrite(self._chain, keep=keep)
+            self.balance_index.sync(self._chain)
+
+            if is_validated:
+                self._validated_height = max(len(self._chain) - 1, 0)
+            else:
+                self._validated_height = max(min(self._validated_height, keep - 1), 0)
+            is_new_tip = bool(self._chain) and (
+                previous_tip is None
+                or self._chain[-1].get('hash') != previous_tip.get('hash'))
+
+        if is_new_tip:
+            chain_tip_signal.notify()
+
+        return True
+
+    def append_block(self, block: dict) -> bool:
+        """
+        Adiciona um bloco na ponta da cadeia e persiste no disco.
+
+        Como a ponta muda, a mineração em andamento é sinalizada.
+
+        :return: False se o bloco não se encaixa na ponta atual.
+        """
+        with self._lock:
+            chain = self._ensure_loaded()
+            if chain and (block.get('index') != len(chain)
+                          or block.get('previous_hash') != chain[-1].get('hash')):
+                return False
+
+            chain.append(block)
+            self.storage.append(chain)
+            self.balance_index.apply_block(block)
+
+        chain_tip_signal.notify()
+        return True
+
+
+_chain_stores = {}
+_chain_stores_lock = threading.Lock()
+
+
+def get_chain_store(block_file_path: Path = settings.BLOCKCHAIN_FILE) -> ChainStore:
+    """
+    Retorna o ChainStore do processo associado ao arquivo informado.
+    """
+    if not isinstance(block_file_path, Path):
+        raise ValueError("O parâmetro block_file_path deve ser um objeto do tipo Path.")
+
+    key = block_file_path.resolve()
+    with _chain_stores_lock:
+        if key not in _chain_stores:
+            _chain_stores[key] = ChainStore(block_file_path=block_file_path)
+        return _chain_stores[key]
@@ -0,0 +1,93 @@
+import hashlib
+
+from pycoin.utils.hashing import canonical_encode, sha256_hex
+
+
+def transaction_hash(transaction: dict) -> str:
+    """
+    Calcula o hash (folha da árvore de Merkle) de uma transação.
+    """
+    return sha256_hex(canonical_encode(transaction))
+
+
+def _hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256(bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def _next_level(level: list) -> list:
+    # Em níveis com quantidade ímpar o último hash é duplicado
+    if len(level) % 2:
+        level = [*level, level[-1]]
+    return [_hash_pair(level[index], level[index + 1])
+            for index in range(0, len(level), 2)]
+
+
+def merkle_root(leaves: list) -> str:
+    """
+    Calcula a raiz da árvore de Merkle a partir dos hashes das folhas.
+
+    :param leaves: Lista de hashes (hexadecimais) das transações.
+    :return: Hash da raiz. Para uma lista vazia retorna o SHA-256 de bytes vazios.
+    """
+    if not leaves:
+        return sha256_hex(b'')
+
+    level = list(leaves)
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+def transaction_hashes(transactions: list) -> list:
+    """
+    Hashes das transações de um bloco, na ordem do bloco (folhas da árvore).
+    """
+    return [transaction_hash(transaction) for transaction in transactions]
+
+
+def calculate_merkle_root(transactions: list) -> str:
+    """
+    Calcula a raiz de Merkle das transações de um bloco.
+    """
+    return merkle_root(transaction_hashes(transactions))
+
+
+def merkle_proof(leaves: list, index: int) -> list:
+    """
+    Gera a prova de inclusão da folha de posição index.
+
+    :return: Lista de passos {'position': 'left' | 'right', 'hash': ...} do
+        nível das folhas até a raiz. position indica o lado do hash irmão.
+    """
+    if not 0 <= index < len(leaves):
+        raise IndexError('Transação fora do intervalo de folhas.')
+
+    proof = []
+    level = list(leaves)
+    while len(level) > 1:
+        if len(level) % 2:
+            level = [*level, level[-1]]
+
+        sibling = index + 1 if index % 2 == 0 else index - 1
+        proof.append({
+            'position': 'right' if index % 2 == 0 else 'left',
+            'hash': level[sibling],
+        })
+
+        level = _next_level(level)
+        index //= 2
+
+    return proof
+
+
+def verify_merkle_proof(leaf: str, proof: list, root: str) -> bool:
+    """
+    Verifica se a folha pertence à árvore com a raiz informada.
+    """
+    current = leaf
+    for step in proof:
+        if step['position'] == 'left':
+            current = _hash_pair(step['hash'], current)
+        else:
+            current = _hash_pair(current, step['hash'])
+    return current == root
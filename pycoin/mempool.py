@@ -0,0 +1,403 @@
+import json
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Optional
+
+from pycoin.blockchain.balance_index import transaction_deltas
+from pycoin.settings.config import Settings
+from pycoin.utils.hashing import canonical_encode, sha256_hex
+
+settings = Settings()
+
+# Remetente das transações de recompensa, criadas no próprio bloco minerado
+REWARD_SENDER = 'MINING_REWARD'
+
+
+def transaction_id(transaction: dict) -> str:
+    """
+    Calcula o identificador de uma transação (hash canônico sem o campo id).
+    """
+    content = {key: value for key, value in transaction.items() if key != 'id'}
+    return sha256_hex(canonical_encode(content))
+
+
+def encode_journal_entry(entry: dict) -> str:
+    """
+    Linha NDJSON de uma operação do journal.
+    """
+    return json.dumps(entry, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+
+class MempoolSnapshot:
+    def __init__(self, mempool: 'Mempool', transactions: list):
+        """
+        Conjunto de transações reservadas do mempool para um bloco.
+
+        As transações continuam no mempool (e no journal) enquanto o bloco é
+        montado; commit remove apenas as que entraram no bloco e rollback as
+        libera. Usado como context manager, a reserva é liberada na saída se o
+        commit não tiver sido feito.
+        """
+        self.mempool = mempool
+        self.transactions = transactions
+        self.is_closed = False
+
+    @property
+    def tx_ids(self) -> list:
+        return [transaction['id'] for transaction in self.transactions]
+
+    def commit(self, tx_ids=None) -> int:
+        """
+        Remove do mempool as transações incluídas e libera as demais.
+
+        :param tx_ids: Ids incluídos no bloco. Por padrão, todas as reservadas.
+        :return: Quantidade de transações removidas.
+        """
+        if self.is_closed:
+            return 0
+        self.is_closed = True
+        return self.mempool._commit_snapshot(
+            self.tx_ids, self.tx_ids if tx_ids is None else tx_ids)
+
+    def rollback(self) -> None:
+        """
+        Libera a reserva sem remover nenhuma transação.
+        """
+        if self.is_closed:
+            return
+        self.is_closed = True
+        self.mempool._commit_snapshot(self.tx_ids, [])
+
+    def __enter__(self) -> 'MempoolSnapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.rollback()
+
+
+class Mempool:
+    def __init__(self, journal_file_path: Optional[Path] = None,
+                 legacy_file_path: Optional[Path] = None,
+                 compact_factor: int = settings.MEMPOOL_JOURNAL_COMPACT_FACTOR,
+                 compact_min: int = settings.MEMPOOL_JOURNAL_COMPACT_MIN):
+        """
+        Conjunto de transações pendentes mantido em memória.
+
+        Inserção O(1) com deduplicação pelo id da transação. A persistência é
+        opcional: cada operação é acrescentada a um journal (write-ahead) em vez
+        de regravar o arquivo inteiro.
+
+        :param journal_file_path: Caminho do journal. Se None, não há persistência.
+        :param legacy_file_path: Arquivo transactions.json antigo, importado uma
+            única vez quando o journal ainda não existe.
+        :param compact_factor: O journal é compactado quando tiver mais que
+            compact_factor vezes a quantidade de transações pendentes.
+        :param compact_min: Quantidade mínima de registros para compactar.
+        """
+        self.journal_file_path = journal_file_path
+        self.compact_factor = compact_factor
+        self.compact_min = compact_min
+        # Transações adicionadas e ids removidos registrados no journal atual
+        self._journal_records = 0
+        self._transactions = OrderedDict()
+        # Saldo pendente e ids das transações pendentes de cada endereço
+        self._pending_balances = defaultdict(float)
+        self._address_transactions = defaultdict(dict)
+        # Ids reservados por snapshots ainda não finalizados
+        self._reserved = set()
+        self._listeners = []
+        self._lock = threading.RLock()
+
+        if journal_file_path is not None and journal_file_path.exists():
+            self._replay_journal()
+        elif legacy_file_path is not None:
+            self._import_legacy_file(legacy_file_path)
+
+    def _replay_journal(self) -> None:
+        with open(self.journal_file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Registro incompleto deixado por uma falha durante a escrita
+                    print(f"Ignorando registro inválido em {self.journal_file_path}")
+                    continue
+                self._apply(entry)
+                self._journal_records += self._count_records(entry)
+        self._compact_journal_if_needed()
+
+    def _import_legacy_file(self, legacy_file_path: Path) -> None:
+        if not legacy_file_path.exists():
+            return
+
+        try:
+            with open(legacy_file_path, 'r', encoding='utf-8') as file:
+                transactions = json.load(file).get('transactions', [])
+        except (json.JSONDecodeError, AttributeError):
+            return
+
+        if not transactions:
+            return
+
+        print(f"Importando {len(transactions)} transações de {legacy_file_path}")
+        self.add_many(transactions)
+
+        # O arquivo antigo é esvaziado para não ser importado novamente
+        with open(legacy_file_path, 'w', encoding='utf-8') as file:
+            json.dump({"transactions": []}, file, indent=4)
+
+    def _insert(self, transaction: dict) -> None:
+        self._transactions[transaction['id']] = transaction
+        for address, delta in transaction_deltas(transaction).items():
+            self._pending_balances[address] += delta
+            self._address_transactions[address][transaction['id']] = None
+
+    def _discard(self, tx_id: str) -> None:
+        self._reserved.discard(tx_id)
+        transaction = self._transactions.pop(tx_id, None)
+        if transaction is None:
+            return
+
+        for address, delta in transaction_deltas(transaction).items():
+            self._pending_balances[address] -= delta
+            self._address_transactions[address].pop(tx_id, None)
+            if not self._address_transactions[address]:
+                del self._address_transactions[address]
+                del self._pending_balances[address]
+
+    def _reset(self) -> None:
+        self._transactions.clear()
+        self._reserved.clear()
+        self._pending_balances.clear()
+        self._address_transactions.clear()
+
+    def _apply(self, entry: dict) -> None:
+        operation = entry.get('op')
+        if operation == 'add':
+            # Journals antigos podem conter recompensas, que nunca sairiam do mempool
+            for transaction in entry['transactions']:
+                if transaction.get('address_sender') != REWARD_SENDER:
+                    self._insert(transaction)
+        elif operation == 'remove':
+            for tx_id in entry['ids']:
+                self._discard(tx_id)
+        elif operation == 'clear':
+            self._reset()
+
+    @staticmethod
+    def _count_records(entry: dict) -> int:
+        return len(entry.get('transactions', ())) + len(entry.get('ids', ()))
+
+    def _write_journal(self, entry: dict) -> None:
+        if self.journal_file_path is None:
+            return
+
+        if entry['op'] == 'clear':
+            # Com o mempool vazio o journal pode ser reiniciado
+            self.journal_file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_file_path, 'w', encoding='utf-8') as file:
+                file.flush()
+                os.fsync(file.fileno())
+            self._journal_records = 0
+            return
+
+        self._journal_records += self._count_records(entry)
+
+        self.journal_file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_file_path, 'a', encoding='utf-8') as file:
+            file.write(encode_journal_entry(entry))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _compact_journal_if_needed(self) -> None:
+        """
+        Reescreve o journal com apenas as transações pendentes quando os
+        registros de transações já removidas passam a dominar o arquivo.
+
+        A nova versão é gravada em um arquivo temporário e substitui o journal
+        atomicamente, então uma falha durante a compactação não perde dados.
+        """
+        if self.journal_file_path is None or self._journal_records <= max(
+                self.compact_min, self.compact_factor * len(self._transactions)):
+            return
+
+        temporary_path = self.journal_file_path.with_suffix(
+            self.journal_file_path.suffix + '.tmp')
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            if self._transactions:
+                entry = {'op': 'add', 'transactions': list(self._transactions.values())}
+                file.write(encode_journal_entry(entry))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.journal_file_path)
+        self._journal_records = len(self._transactions)
+
+    def subscribe(self, listener) -> None:
+        """
+        Registra uma função chamada a cada alteração do mempool.
+
+        A função recebe a operação ('add', 'remove' ou 'clear') e as transações
+        adicionadas ou os ids removidos. É chamada com o mempool bloqueado, então
+        deve ser rápida e não pode acessar o mempool de outra thread.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _notify(self, operation: str, data: list) -> None:
+        for listener in self._listeners:
+            listener(operation, data)
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def __contains__(self, tx_id: str) -> bool:
+        return tx_id in self._transactions
+
+    def add(self, transaction: dict) -> bool:
+        """
+        Adiciona uma transação. Retorna False se ela já estiver no mempool.
+        """
+        return bool(self.add_many([transaction]))
+
+    def add_many(self, transactions: list) -> list:
+        """
+        Adiciona várias transações com uma única escrita no journal.
+
+        Recompensas de mineração são ignoradas: elas são criadas dentro do bloco
+        e nunca seriam removidas do mempool.
+
+        :return: As transações efetivamente adicionadas (com o campo id).
+        """
+        with self._lock:
+            added = {}
+            for pending in transactions:
+                if pending.get('address_sender') == REWARD_SENDER:
+                    continue
+                transaction = dict(pending)
+                transaction.setdefault('id', transaction_id(transaction))
+                if transaction['id'] not in self._transactions \
+                        and transaction['id'] not in added:
+                    added[transaction['id']] = transaction
+
+            if added:
+                self._write_journal({'op': 'add', 'transactions': list(added.values())})
+                for transaction in added.values():
+                    self._insert(transaction)
+                self._compact_journal_if_needed()
+                self._notify('add', list(added.values()))
+
+            return list(added.values())
+
+    def get(self, tx_id: str) -> Optional[dict]:
+        return self._transactions.get(tx_id)
+
+    def pending_balance(self, address: str) -> float:
+        """
+        Variação de saldo do endereço causada pelas transações pendentes.
+        """
+        return self._pending_balances.get(address, 0)
+
+    def address_transactions(self, address: str) -> list:
+        """
+        Transações pendentes que envolvem o endereço, em ordem de chegada.
+        """
+        with self._lock:
+            return [self._transactions[tx_id]
+                    for tx_id in self._address_transactions.get(address, {})]
+
+    def snapshot(self) -> list:
+        """
+        Retorna as transações pendentes em ordem de chegada, sem removê-las.
+        """
+        with self._lock:
+            return list(self._transactions.values())
+
+    def take_snapshot(self, tx_ids=None) -> MempoolSnapshot:
+        """
+        Reserva transações pendentes para um bloco, sem removê-las.
+
+        Transações já reservadas por outro snapshot ou que não estão mais no
+        mempool são ignoradas. Transações adicionadas depois não fazem parte
+        do snapshot e nunca são afetadas por ele.
+
+        :param tx_ids: Ids desejados, na ordem do bloco. Por padrão, todas as
+            transações livres em ordem de chegada.
+        """
+        with self._lock:
+            if tx_ids is None:
+                tx_ids = self._transactions.keys()
+            transactions = [self._transactions[tx_id]
+                            for tx_id in dict.fromkeys(tx_ids)
+                            if tx_id in self._transactions
+                            and tx_id not in self._reserved]
+            self._reserved.update(transaction['id'] for transaction in transactions)
+            return MempoolSnapshot(self, transactions)
+
+    def _commit_snapshot(self, reserved_ids: list, included_ids) -> int:
+        with self._lock:
+            self._reserved.difference_update(reserved_ids)
+            reserved_ids = set(reserved_ids)
+            return self.remove([tx_id for tx_id in included_ids if tx_id in reserved_ids])
+
+    def remove(self, tx_ids) -> int:
+        """
+        Remove as transações informadas.
+
+        :return: Quantidade de transações removidas.
+        """
+        with self._lock:
+            removed = [tx_id for tx_id in tx_ids if tx_id in self._transactions]
+            if not removed:
+                return 0
+
+            if len(removed) == len(self._transactions):
+                self._write_journal({'op': 'clear'})
+            else:
+                self._write_journal({'op': 'remove', 'ids': removed})
+
+            for tx_id in removed:
+                self._discard(tx_id)
+            self._compact_journal_if_needed()
+            self._notify('remove', removed)
+            return len(removed)
+
+    def drain(self) -> list:
+        """
+        Retorna todas as transações pendentes e esvazia o mempool.
+        """
+        with self._lock:
+            transactions = list(self._transactions.values())
+            self.clear()
+            return transactions
+
+    def clear(self) -> None:
+        with self._lock:
+            self._write_journal({'op': 'clear'})
+            self._reset()
+            self._notify('clear', [])
+
+
+_mempools = {}
+_mempools_lock = threading.Lock()
+
+
+def get_mempool(transactions_file_path: Path = settings.TRANSACTIONS_FILE) -> Mempool:
+    """
+    Retorna o mempool do processo associado ao arquivo de transações informado.
+
+    Com MEMPOOL_JOURNAL habilitado o journal fica ao lado do arquivo (.journal).
+    """
+    if not isinstance(transactions_file_path, Path):
+        raise ValueError(
+            "O parâmetro transactions_file_path deve ser um objeto do tipo Path.")
+
+    key = transactions_file_path.resolve()
+    with _mempools_lock:
+        if key not in _mempools:
+            journal_file_path = transactions_file_path.with_suffix('.journal') \
+                if settings.MEMPOOL_JOURNAL else None
+            _mempools[key] = Mempool(journal_file_path=journal_file_path,
+                                     legacy_file_path=transactions_file_path)
+        return _mempools[key]
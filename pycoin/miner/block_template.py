@@ -0,0 +1,200 @@
+import heapq
+import itertools
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+from pycoin.blockchain.chain_store import ChainStore, get_chain_store
+from pycoin.mempool import Mempool, get_mempool
+from pycoin.settings.config import Settings
+from pycoin.utils.hashing import canonical_encode
+
+settings = Settings()
+
+
+def transaction_fee(transaction: dict) -> float:
+    return float(transaction.get('fee', 0) or 0)
+
+
+def transaction_size(transaction: dict) -> int:
+    """
+    Tamanho da transação em bytes na codificação canônica.
+    """
+    return len(canonical_encode(transaction))
+
+
+def template_fees(transactions: list) -> float:
+    """
+    Soma das taxas das transações, paga ao minerador junto com a recompensa.
+    """
+    return sum(transaction_fee(transaction) for transaction in transactions)
+
+
+class BlockTemplateBuilder:
+    def __init__(self, mempool: Mempool, chain_store: ChainStore,
+                 max_bytes: int = settings.BLOCK_MAX_BYTES,
+                 max_transactions: int = settings.BLOCK_MAX_TRANSACTIONS):
+        """
+        Monta as transações do próximo bloco a partir do mempool.
+
+        As transações são escolhidas por um heap ordenado pela taxa (maior
+        primeiro) e pela ordem de chegada, respeitando o tamanho máximo do bloco
+        e a quantidade máxima de transações. Transações que gastam mais do que
+        o saldo confirmado do remetente (somado ao que ele recebe no próprio
+        modelo) ficam de fora.
+
+        O modelo acompanha o mempool: transações novas que cabem são
+        acrescentadas na hora e o modelo só é remontado quando uma transação
+        incluída sai do mempool, quando uma nova de maior prioridade não cabe
+        ou quando a ponta da cadeia muda.
+
+        :param max_bytes: Tamanho máximo somado das transações, em bytes.
+        :param max_transactions: Quantidade máxima de transações.
+        """
+        self.chain_store = chain_store
+        self.max_bytes = max_bytes
+        self.max_transactions = max_transactions
+        # id -> (ordem de chegada, transação, tamanho)
+        self._entries = {}
+        self._sequence = itertools.count()
+        self._selected = []
+        self._selected_ids = set()
+        self._selected_bytes = 0
+        self._lowest_priority = None
+        self._spent = defaultdict(float)
+        self._received = defaultdict(float)
+        self._tip_hash = None
+        self._is_dirty = True
+        self._lock = threading.RLock()
+
+        mempool.subscribe(self._on_mempool_change)
+        self._add(mempool.snapshot())
+
+    def _priority(self, tx_id: str) -> tuple:
+        sequence, transaction, _ = self._entries[tx_id]
+        return -transaction_fee(transaction), sequence
+
+    def _on_mempool_change(self, operation: str, data: list) -> None:
+        if operation == 'add':
+            self._add(data)
+        elif operation == 'remove':
+            self._remove(data)
+        elif operation == 'clear':
+            with self._lock:
+                self._entries.clear()
+                self._is_dirty = True
+
+    def _add(self, transactions: list) -> None:
+        with self._lock:
+            for transaction in transactions:
+                if transaction['id'] in self._entries:
+                    continue
+
+                self._entries[transaction['id']] = (
+                    next(self._sequence), transaction, transaction_size(transaction))
+                if self._is_dirty:
+                    continue
+
+                # Uma transação que não cabe só justifica remontar o modelo se
+                # tiver prioridade maior que alguma das já escolhidas
+                if not self._fits(transaction['id']):
+                    if self._lowest_priority is not None \
+                            and self._priority(transaction['id']) < self._lowest_priority:
+                        self._is_dirty = True
+                    continue
+
+                self._try_select(transaction['id'])
+
+    def _remove(self, tx_ids: list) -> None:
+        with self._lock:
+            for tx_id in tx_ids:
+                self._entries.pop(tx_id, None)
+                if tx_id in self._selected_ids:
+                    self._is_dirty = True
+
+    def _available(self, address: str) -> float:
+        return self.chain_store.balance_index.balance(address) \
+            + self._received[address] - self._spent[address]
+
+    def _fits(self, tx_id: str) -> bool:
+        return len(self._selected) < self.max_transactions \
+            and self._selected_bytes + self._entries[tx_id][2] <= self.max_bytes
+
+    def _try_select(self, tx_id: str) -> bool:
+        """
+        Inclui a transação no modelo se ela couber e o remetente tiver saldo.
+        """
+        if not self._fits(tx_id):
+            return False
+
+        _, transaction, size = self._entries[tx_id]
+
+        sender = transaction.get('address_sender')
+        cost = transaction.get('amount', 0) + transaction_fee(transaction)
+        if self._available(sender) < cost:
+            return False
+
+        self._selected.append(tx_id)
+        self._selected_ids.add(tx_id)
+        self._selected_bytes += size
+        priority = self._priority(tx_id)
+        if self._lowest_priority is None or priority > self._lowest_priority:
+            self._lowest_priority = priority
+        self._spent[sender] += cost
+        recipient = transaction.get('recipient_address')
+        self._received[recipient] += transaction.get('amount', 0)
+        return True
+
+    def _rebuild(self) -> None:
+        self._selected = []
+        self._selected_ids = set()
+        self._selected_bytes = 0
+        self._lowest_priority = None
+        self._spent.clear()
+        self._received.clear()
+
+        heap = [(*self._priority(tx_id), tx_id) for tx_id in self._entries]
+        heapq.heapify(heap)
+        while heap and len(self._selected) < self.max_transactions:
+            *_, tx_id = heapq.heappop(heap)
+            self._try_select(tx_id)
+
+        self._is_dirty = False
+
+    def get_template(self) -> list:
+        """
+        Retorna as transações do próximo bloco, sem a recompensa do minerador.
+
+        O modelo só é remontado se algo relevante mudou desde a última chamada.
+        """
+        # Garante que a cadeia e o índice de saldos estejam carregados
+        len(self.chain_store)
+        tip = self.chain_store.tip()
+        tip_hash = tip.get('hash') if tip else None
+
+        with self._lock:
+            if self._is_dirty or tip_hash != self._tip_hash:
+                self._tip_hash = tip_hash
+                self._rebuild()
+
+            return [self._entries[tx_id][1] for tx_id in self._selected]
+
+
+_builders = {}
+_builders_lock = threading.Lock()
+
+
+def get_block_template_builder(block_file_path: Path = settings.BLOCKCHAIN_FILE,
+                               transactions_file_path: Path = settings.TRANSACTIONS_FILE,
+                               ) -> BlockTemplateBuilder:
+    """
+    Retorna o montador de blocos do processo para a cadeia e o mempool informados.
+    """
+    key = (Path(block_file_path).resolve(), Path(transactions_file_path).resolve())
+    with _builders_lock:
+        if key not in _builders:
+            _builders[key] = BlockTemplateBuilder(
+                mempool=get_mempool(transactions_file_path),
+                chain_store=get_chain_store(block_file_path),
+            )
+        return _builders[key]
@@ -1,10 +1,14 @@
 import asyncio
 
+from pycoin.miner.mining_utils import chain_tip_signal
+
 
 class MinerManager:
-    def __init__(self):
+    def __init__(self, pause: float = 2):
         self.is_mining = False
         self.miner_task = None
+        # Intervalo, em segundos, entre as rodadas de mineração
+        self.pause = pause
 
     async def start_mining(self, mine_function):
         if self.is_mining:
@@ -27,6 +31,13 @@ class MinerManager:
     async def _mining_loop(self, mine_function):
         while self.is_mining:
             print(">>>>>>Iniciando Mineração<<<<<<")
+            generation = chain_tip_signal.generation
             result = await mine_function()  # Executa a função de mineração fornecida
-            await asyncio.sleep(2)  # Intervalo opcional entre as minerações
+            # O bloco minerado aqui também muda a ponta; só um bloco de outro nó
+            # (rodada sem resultado) reinicia a mineração sem a pausa
+            if not result and chain_tip_signal.is_stale(generation):
+                # A cadeia foi substituída: reinicia imediatamente sobre a nova ponta
+                print(">>>>>>Nova ponta da cadeia, reiniciando mineração<<<<<<")
+                continue
+            await asyncio.sleep(self.pause)  # Intervalo opcional entre as minerações
             print(f">>>>>>Retomando Mineração {self.is_mining}<<<<<<")
@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from typing import Optional
+
+from pycoin.settings.config import Settings
+
+settings = Settings()
+
+# Quantidade de nonces testados entre cada consulta ao sinal de parada
+STOP_CHECK_INTERVAL = 1024
+
+# Estado do processo worker: sinal de parada compartilhado (definido no initializer)
+_worker = {}
+
+
+def _init_worker(stop_event) -> None:
+    """
+    Inicializa o processo worker guardando o sinal de parada compartilhado.
+    """
+    _worker['stop_event'] = stop_event
+
+
+def is_valid_proof(new_proof: int, previous_proof: int, difficulty: int = 4) -> bool:
+    """
+    Verifica se o proof atende a dificuldade em relação ao proof anterior.
+
+    :param new_proof: Proof candidato.
+    :param previous_proof: A prova do bloco anterior.
+    :param difficulty: Número de zeros iniciais necessários no hash.
+    :return: True se o hash começar com a quantidade de zeros exigida.
+    """
+    hash_operation = hashlib.sha256(
+        f"{new_proof**2 - previous_proof**2}".encode()
+    ).hexdigest()
+    return hash_operation[:difficulty] == '0' * difficulty
+
+
+def search_nonce_range(previous_proof: int, difficulty: int,
+                       start: int, end: int) -> Optional[int]:
+    """
+    Procura um proof válido no intervalo [start, end).
+
+    Executado dentro dos processos do pool. A cada STOP_CHECK_INTERVAL nonces
+    o sinal de parada é consultado, permitindo abortar a busca quando outro
+    worker já encontrou a prova.
+
+    :return: O primeiro proof válido do intervalo ou None.
+    """
+    target = '0' * difficulty
+    previous_square = previous_proof**2
+    sha256 = hashlib.sha256
+
+    for block_start in range(start, end, STOP_CHECK_INTERVAL):
+        stop_event = _worker.get('stop_event')
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+        for new_proof in range(block_start, min(block_start + STOP_CHECK_INTERVAL, end)):
+            hash_operation = sha256(
+                f"{new_proof * new_proof - previous_square}".encode()
+            ).hexdigest()
+            if hash_operation[:difficulty] == target:
+                return new_proof
+
+    return None
+
+
+class ChainTipSignal:
+    def __init__(self):
+        """
+        Sinal compartilhado entre a substituição da cadeia e a mineração.
+
+        Cada troca da ponta da cadeia incrementa a geração; uma busca iniciada
+        em uma geração anterior é considerada obsoleta e deve ser abortada.
+        """
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def is_stale(self, generation: Optional[int]) -> bool:
+        return generation is not None and generation != self._generation
+
+    def subscribe(self, listener) -> None:
+        """
+        Registra uma função chamada sempre que a ponta da cadeia mudar.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def notify(self) -> None:
+        """
+        Informa que a ponta da cadeia mudou. Pode ser chamado de qualquer thread.
+        """
+        with self._lock:
+            self._generation += 1
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener()
+
+
+chain_tip_signal = ChainTipSignal()
+
+
+class ProofOfWorkEngine:
+    def __init__(self,
+                 workers: int = settings.MINING_WORKERS,
+                 chunk_size: int = settings.MINING_NONCE_CHUNK):
+        """
+        Motor de prova de trabalho que divide o espaço de nonces em intervalos
+        e os distribui entre um pool de processos.
+
+        :param workers: Quantidade de processos usados na busca.
+        :param chunk_size: Quantidade de nonces de cada intervalo.
+        """
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self._stop_event = multiprocessing.Event()
+        self._executor = None
+        self._lock = asyncio.Lock()
+        chain_tip_signal.subscribe(self.cancel)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._stop_event,),
+            )
+        return self._executor
+
+    def cancel(self) -> None:
+        """
+        Interrompe a busca em andamento. Os workers param em poucos milissegundos.
+        """
+        self._stop_event.set()
+
+    async def search(self, previous_proof: int, difficulty: int = 4,
+                     generation: Optional[int] = None) -> Optional[int]:
+        """
+        Busca um proof válido sem bloquear o event loop.
+
+        Cada worker recebe um intervalo de nonces; quando um intervalo termina
+        sem sucesso o próximo intervalo livre é enviado. Ao encontrar a prova
+        os demais workers são sinalizados para parar.
+
+        :param generation: Geração da ponta da cadeia usada como base. Se a
+            ponta mudar durante a busca, ela é abortada.
+        :return: O proof encontrado ou None se a busca foi cancelada.
+        """
+        async with self._lock:
+            self._stop_event.clear()
+            if chain_tip_signal.is_stale(generation):
+                return None
+
+            executor = self._get_executor()
+            next_start = 1
+            pending = set()
+
+            def submit_next_range():
+                nonlocal next_start
+                future = executor.submit(search_nonce_range, previous_proof, difficulty,
+                                         next_start, next_start + self.chunk_size)
+                pending.add(asyncio.wrap_future(future))
+                next_start += self.chunk_size
+
+            for _ in range(self.workers):
+                submit_next_range()
+
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED)
+
+                    proofs = [future.result() for future in done
+                              if future.result() is not None]
+                    if proofs:
+                        return min(proofs)
+
+                    if self._stop_event.is_set() or chain_tip_signal.is_stale(generation):
+                        print('Busca do proof cancelada: a ponta da cadeia mudou')
+                        return None
+
+                    for _ in done:
+                        submit_next_range()
+            finally:
+                # Interrompe os workers restantes e aguarda a liberação do pool
+                self._stop_event.set()
+                if pending:
+                    await asyncio.wait(pending)
+
+    def shutdown(self) -> None:
+        """
+        Encerra o pool de processos.
+        """
+        self._stop_event.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+@cache
+def get_pow_engine() -> ProofOfWorkEngine:
+    """
+    Retorna o motor de prova de trabalho do processo, criando-o se necessário.
+    """
+    return ProofOfWorkEngine()
@@ -0,0 +1,114 @@
+import asyncio
+import weakref
+from typing import Optional
+
+import httpx
+
+from pycoin.settings.config import Settings
+
+settings = Settings()
+
+
+class PeerClient:
+    def __init__(self,
+                 timeout: float = settings.PEER_TIMEOUT,
+                 max_connections: int = settings.PEER_MAX_CONNECTIONS,
+                 max_concurrency: int = settings.PEER_MAX_CONCURRENCY,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Cliente HTTP assíncrono para comunicação entre nós.
+
+        Reaproveita conexões (keep-alive), aplica timeout em todas as
+        requisições e limita a quantidade de requisições simultâneas.
+
+        :param timeout: Timeout, em segundos, de cada requisição.
+        :param max_connections: Tamanho máximo do pool de conexões.
+        :param max_concurrency: Quantidade máxima de requisições em andamento.
+        :param transport: Transporte HTTP alternativo (usado nos testes).
+        """
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def request(self, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """
+        Realiza uma requisição e lida com possíveis erros.
+
+        :return: A resposta ou None em caso de erro de conexão, timeout ou status de erro.
+        """
+        async with self._semaphore:
+            try:
+                response = await self._client.request(method, url, **kwargs)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                print(f"Erro na requisição {method} {url}: {e!r}")
+                return None
+
+    async def get(self, node: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        return await self.request('GET', f'http://{node}{path}', **kwargs)
+
+    async def post(self, node: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        return await self.request('POST', f'http://{node}{path}', **kwargs)
+
+    async def ping(self, node: str) -> bool:
+        """
+        Verifica se um nó está acessível.
+        """
+        response = await self.get(node, '/ping')
+        return response is not None
+
+    async def ping_many(self, nodes: list) -> dict:
+        """
+        Verifica vários nós em paralelo.
+
+        :return: Dicionário nó -> True se estiver online.
+        """
+        results = await asyncio.gather(*(self.ping(node) for node in nodes))
+        return dict(zip(nodes, results))
+
+    async def get_many(self, nodes: list, path: str, **kwargs) -> dict:
+        """
+        Realiza a mesma requisição GET em vários nós em paralelo.
+
+        :return: Dicionário nó -> resposta (None em caso de erro).
+        """
+        responses = await asyncio.gather(
+            *(self.get(node, path, **kwargs) for node in nodes))
+        return dict(zip(nodes, responses))
+
+
+# Um cliente por event loop: o pool de conexões do httpx fica preso ao loop que o criou
+_peer_clients = weakref.WeakKeyDictionary()
+
+
+def get_peer_client() -> PeerClient:
+    """
+    Retorna o cliente de peers do event loop em execução, criando-o se necessário.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _peer_clients:
+        _peer_clients[loop] = PeerClient()
+    return _peer_clients[loop]
+
+
+async def close_peer_client() -> None:
+    """
+    Fecha o cliente de peers do event loop em execução.
+    """
+    client = _peer_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from typing import Callable, Optional
+
+from pycoin.network.peer_client import PeerClient, get_peer_client
+from pycoin.settings.config import Settings
+
+settings = Settings()
+
+
+class PeerStatus:
+    def __init__(self, node: str):
+        """
+        Estado de saúde conhecido de um nó.
+        """
+        self.node = node
+        self.is_online = False
+        self.latency = None
+        self.failures = 0
+        self.last_checked = None
+        self.next_check = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'node': self.node,
+            'is_online': self.is_online,
+            'latency': self.latency,
+            'failures': self.failures,
+        }
+
+
+class PeerManager:
+    def __init__(self,
+                 load_nodes: Callable[[], list],
+                 client: Optional[PeerClient] = None,
+                 refresh_interval: float = settings.PEER_REFRESH_INTERVAL,
+                 max_backoff: float = settings.PEER_MAX_BACKOFF,
+                 clock=time.monotonic):
+        """
+        Mantém em cache a disponibilidade, a latência e as falhas de cada nó.
+
+        Os caminhos críticos (propagação e sincronização) consultam o cache em vez
+        de pingar os nós. A verificação é feita em segundo plano; um nó que falha
+        é reconsultado com espera exponencial, até max_backoff segundos.
+
+        :param load_nodes: Função que retorna a lista de nós conhecidos.
+        :param client: Cliente usado nos pings. Por padrão o do event loop atual.
+        :param refresh_interval: Intervalo, em segundos, entre verificações de um nó
+            online.
+        :param max_backoff: Espera máxima, em segundos, para reconsultar um nó offline.
+        :param clock: Função que retorna o instante atual (usada nos testes).
+        """
+        self._load_nodes = load_nodes
+        self._client = client
+        self.refresh_interval = refresh_interval
+        self.max_backoff = max_backoff
+        self.my_node = settings.MY_NODE
+        self._clock = clock
+        self._peers = {}
+        self._task = None
+
+    @property
+    def client(self) -> PeerClient:
+        return self._client or get_peer_client()
+
+    def _sync_nodes(self) -> None:
+        nodes = [node for node in self._load_nodes() if node != self.my_node]
+        for node in nodes:
+            self._peers.setdefault(node, PeerStatus(node))
+        for node in set(self._peers) - set(nodes):
+            del self._peers[node]
+
+    def status(self, node: str) -> Optional[PeerStatus]:
+        return self._peers.get(node)
+
+    def is_known(self, node: str) -> bool:
+        """
+        Indica se o nó está na lista de nós conhecidos (relida a cada chamada).
+        """
+        self._sync_nodes()
+        return node in self._peers
+
+    def statuses(self) -> list:
+        if not self._peers:
+            self._sync_nodes()
+        return list(self._peers.values())
+
+    def live_peers(self) -> list:
+        """
+        Nós considerados online, do menor para o maior tempo de resposta.
+
+        Nós ainda não verificados são incluídos até que falhem.
+        """
+        peers = [status for status in self.statuses()
+                 if status.is_online or status.last_checked is None]
+        return [status.node for status in sorted(
+            peers, key=lambda status: (status.latency is None, status.latency or 0))]
+
+    def record_success(self, node: str, latency: float) -> None:
+        status = self._peers.setdefault(node, PeerStatus(node))
+        now = self._clock()
+        status.is_online = True
+        status.latency = latency
+        status.failures = 0
+        status.last_checked = now
+        status.next_check = now + self.refresh_interval
+
+    def record_failure(self, node: str) -> None:
+        status = self._peers.setdefault(node, PeerStatus(node))
+        now = self._clock()
+        status.is_online = False
+        status.failures += 1
+        status.last_checked = now
+        status.next_check = now + min(
+            self.refresh_interval * 2 ** (status.failures - 1), self.max_backoff)
+
+    async def check(self, node: str) -> bool:
+        """
+        Pinga o nó imediatamente e atualiza o cache.
+        """
+        started_at = time.perf_counter()
+        is_online = await self.client.ping(node)
+        if is_online:
+            self.record_success(node, time.perf_counter() - started_at)
+        else:
+            self.record_failure(node)
+        return is_online
+
+    async def refresh(self) -> None:
+        """
+        Verifica, em paralelo, apenas os nós cuja próxima verificação já venceu.
+        """
+        self._sync_nodes()
+        now = self._clock()
+        due = [node for node, status in self._peers.items() if status.next_check <= now]
+        await asyncio.gather(*(self.check(node) for node in due))
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f'Erro ao verificar os nós: {e}')
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        """
+        Inicia a verificação periódica em segundo plano no event loop atual.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -0,0 +1,98 @@
+import asyncio
+import weakref
+from http import HTTPStatus
+from typing import Optional
+
+from pycoin.network.peer_client import PeerClient, get_peer_client
+
+
+class BlockPropagator:
+    def __init__(self, client: Optional[PeerClient] = None):
+        """
+        Distribui anúncios de blocos para os demais nós sem bloquear quem anuncia.
+
+        Cada nó tem uma fila de saída com uma única posição: um anúncio ainda não
+        enviado é substituído pelo mais recente, pois ele o torna obsoleto. Os
+        envios para nós diferentes são independentes, então um nó lento ou fora
+        do ar não atrasa a entrega aos demais. A concorrência total é limitada
+        pelo cliente de peers.
+
+        :param client: Cliente usado nos envios. Por padrão o do event loop atual.
+        """
+        self._client = client
+        # nó -> (caminho, payload, cabeçalhos) do próximo anúncio a enviar
+        self._pending = {}
+        self._workers = {}
+
+    @property
+    def client(self) -> PeerClient:
+        return self._client or get_peer_client()
+
+    def announce(self, path: str, payload: dict, nodes: list,
+                 headers: Optional[dict] = None) -> None:
+        """
+        Agenda o envio do payload para os nós informados e retorna imediatamente.
+
+        Deve ser chamado de dentro do event loop.
+
+        :param headers: Cabeçalhos HTTP adicionais do anúncio.
+        """
+        for node in nodes:
+            self._pending[node] = (path, payload, headers)
+            if node not in self._workers:
+                self._workers[node] = asyncio.create_task(self._deliver(node))
+
+    async def _deliver(self, node: str) -> None:
+        try:
+            while node in self._pending:
+                path, payload, headers = self._pending.pop(node)
+                response = await self.client.post(node, path, json=payload,
+                                                  headers=headers)
+                if response is not None and response.status_code == HTTPStatus.OK:
+                    print(f'Sucesso ao notificar {node}')
+                else:
+                    print(f'Erro ao notificar {node}')
+        finally:
+            del self._workers[node]
+
+    def pending_nodes(self) -> list:
+        """
+        Nós com envio em andamento ou aguardando.
+        """
+        return list(self._workers)
+
+    async def wait_idle(self) -> None:
+        """
+        Aguarda até que todos os anúncios pendentes tenham sido enviados.
+        """
+        while self._workers:
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+
+    async def close(self) -> None:
+        """
+        Descarta os anúncios pendentes e interrompe os envios em andamento.
+        """
+        self._pending.clear()
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+_propagators = weakref.WeakKeyDictionary()
+
+
+def get_block_propagator() -> BlockPropagator:
+    """
+    Retorna o propagador de blocos do event loop em execução.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _propagators:
+        _propagators[loop] = BlockPropagator()
+    return _propagators[loop]
+
+
+async def close_block_propagator() -> None:
+    propagator = _propagators.pop(asyncio.get_running_loop(), None)
+    if propagator is not None:
+        await propagator.close()
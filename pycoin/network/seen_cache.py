@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+from pycoin.settings.config import Settings
+
+settings = Settings()
+
+
+class SeenCache:
+    def __init__(self,
+                 max_size: int = settings.GOSSIP_SEEN_MAX_SIZE,
+                 ttl: float = settings.GOSSIP_SEEN_TTL,
+                 clock=time.monotonic):
+        """
+        Conjunto dos hashes de blocos vistos recentemente.
+
+        Usado para descartar anúncios repetidos antes de qualquer processamento.
+        As entradas expiram após ttl segundos e, ao atingir max_size, as mais
+        antigas são descartadas primeiro.
+
+        :param max_size: Quantidade máxima de hashes mantidos.
+        :param ttl: Tempo, em segundos, que um hash permanece no conjunto.
+        :param clock: Função que retorna o instante atual (usada nos testes).
+        """
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._clock = clock
+        # hash -> instante de expiração, em ordem de inserção
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict_expired(self, now: float) -> None:
+        while self._entries:
+            key, expires_at = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[key]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._evict_expired(self._clock())
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict_expired(self._clock())
+            return len(self._entries)
+
+    def add(self, key: str) -> bool:
+        """
+        Registra o hash como visto.
+
+        :return: False se ele já havia sido visto (anúncio duplicado).
+        """
+        with self._lock:
+            now = self._clock()
+            self._evict_expired(now)
+            if key in self._entries:
+                return False
+
+            self._entries[key] = now + self.ttl
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return True
+
+
+seen_blocks = SeenCache()
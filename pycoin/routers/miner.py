@@ -1,16 +1,30 @@
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 from pycoin.blockchain.block_utils import (
+    BLOCK_HASH_HEADER,
     add_node,
     check_progagate_blockchain,
-    is_chain_valid,
-    load_chain,
+    get_block_headers,
+    get_blocks_page,
+    get_chain_page,
+    get_chain_tip,
+    get_transaction_proof,
+    iter_chain_ndjson,
     load_nodes,
+    peer_manager,
+    receive_new_block,
     start_block_mining,
     update_blockchain,
+    validate_local_chain,
 )
+from pycoin.blockchain.chain_store import get_chain_store
 from pycoin.miner.miner_manager import MinerManager
-from pycoin.schemas.schemas import NodeListRequest
+from pycoin.network.seen_cache import seen_blocks
+from pycoin.schemas.schemas import BlockAnnouncement, NodeListRequest
 from pycoin.settings.config import Settings
 
 # Instância do gerenciador
@@ -31,21 +45,41 @@ async def stop_mining():
     return {"message": result}
 
 
+def stream_chain(from_height: int, limit: Optional[int]) -> StreamingResponse:
+    """
+    Envia os blocos em NDJSON (um bloco por linha), sem montar a resposta em memória.
+    """
+    return StreamingResponse(iter_chain_ndjson(from_height=from_height, limit=limit),
+                             media_type='application/x-ndjson')
+
+
 @router.get('/get_actual_chain')
-def get_actual_chain():
-    chain = load_chain()
+def get_actual_chain(from_height: int = 0, limit: Optional[int] = None,
+                     stream: bool = False):
+    """
+    Retorna a cadeia a partir de from_height. Com limit a resposta é paginada
+    (no máximo SYNC_PAGE_SIZE blocos) e com stream=true é enviada em NDJSON.
+    """
+    if stream:
+        return stream_chain(from_height, limit)
+
     response = {
         'message': 'Nós presente na rede atualmente',
-        'actual_chain': chain,
+        'actual_chain': get_chain_page(from_height=from_height, limit=limit),
+        'length': len(get_chain_store()),
     }
     return response
 
 
 @router.get('/update_blockchain')
-def replace_the_chain():
-    is_chain_replaced = update_blockchain()
-    chain = load_chain()
+async def replace_the_chain(from_height: int = 0, limit: Optional[int] = None,
+                            stream: bool = False):
+    is_chain_replaced = await update_blockchain()
+
+    if stream:
+        return stream_chain(from_height, limit)
 
+    chain = get_chain_page(from_height=from_height, limit=limit)
     if is_chain_replaced:
         response = {
             'message': 'Nós atualizados com sucesso',
@@ -56,6 +90,7 @@ def replace_the_chain():
             'message': 'Não é necessário atualizar os nós da rede.',
             'actual_chain': chain,
         }
+    response['length'] = len(get_chain_store())
     return response
 
 
@@ -86,9 +121,12 @@ def connect_node(request: NodeListRequest):
 
 
 @router.get('/is_valid')
-def is_valid():
-    chain = load_chain()
-    is_valid = is_chain_valid(chain)
+def is_valid(full: bool = False):
+    """
+    Valida a blockchain local. Com full=true toda a cadeia é revalidada
+    desde o gênesis, em paralelo quando ela é grande.
+    """
+    is_valid = validate_local_chain(is_full=full)
     if is_valid:
         response = {'message': 'Blockchain Válido'}
     else:
@@ -97,10 +135,44 @@ def is_valid():
 
 
 @router.get('/get_chain')
-def get_chain():
-    chain = load_chain()
-    response = {'chain': chain,
-                'length': len(chain)}
+def get_chain(from_height: int = 0, limit: Optional[int] = None, stream: bool = False):
+    """
+    Retorna a cadeia a partir de from_height. Com limit a resposta é paginada
+    (no máximo SYNC_PAGE_SIZE blocos) e com stream=true é enviada em NDJSON.
+
+    O campo length é sempre o tamanho total da cadeia.
+    """
+    if stream:
+        return stream_chain(from_height, limit)
+
+    response = {'chain': get_chain_page(from_height=from_height, limit=limit),
+                'length': len(get_chain_store())}
+    return response
+
+
+@router.get('/tip')
+def tip():
+    """
+    Retorna a altura e o hash do último bloco da cadeia.
+    """
+    return get_chain_tip()
+
+
+@router.get('/headers')
+def headers(from_height: int = 0, limit: int = settings.SYNC_PAGE_SIZE):
+    """
+    Retorna os cabeçalhos dos blocos a partir de from_height (no máximo SYNC_PAGE_SIZE).
+    """
+    response = {'headers': get_block_headers(from_height=from_height, limit=limit)}
+    return response
+
+
+@router.get('/blocks')
+def blocks(from_height: int = 0, limit: int = settings.SYNC_PAGE_SIZE):
+    """
+    Retorna os blocos completos a partir de from_height (no máximo SYNC_PAGE_SIZE).
+    """
+    response = {'blocks': get_blocks_page(from_height=from_height, limit=limit)}
     return response
 
 
@@ -111,12 +183,71 @@ def get_my_nodes():
     return response
 
 
+@router.get('/peers')
+def peers():
+    """
+    Retorna o estado de saúde conhecido de cada nó (sem pingá-los).
+    """
+    response = {'peers': [status.to_dict() for status in peer_manager.statuses()]}
+    return response
+
+
 @router.post('/new_blockchain')
 async def new_blockchain(request: Request):
     json = await request.json()
 
-    response = check_progagate_blockchain(
+    response = await check_progagate_blockchain(
         new_blockchain=json['chain'],
         nodes_updated=json['nodes_updated'])
 
     return response
+
+
+@router.post('/new_block')
+async def new_block(request: Request):
+    """
+    Recebe o anúncio de um único bloco minerado por outro nó.
+
+    Anúncios de blocos já vistos são descartados pelo cabeçalho X-Block-Hash,
+    sem ler o corpo da requisição. O hash só é lembrado depois que o bloco é
+    processado, então um anúncio inválido não impede o recebimento do bloco real.
+    """
+    block_hash = request.headers.get(BLOCK_HASH_HEADER)
+    if block_hash is not None and block_hash in seen_blocks:
+        return {'message': 'Bloco já recebido', 'status': 'known'}
+
+    try:
+        announcement = BlockAnnouncement.model_validate_json(await request.body())
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Anúncio de bloco inválido.")
+
+    if block_hash is None:
+        block_hash = announcement.block.get('hash')
+        if block_hash in seen_blocks:
+            return {'message': 'Bloco já recebido', 'status': 'known'}
+    if block_hash != announcement.block.get('hash'):
+        raise HTTPException(status_code=400,
+                            detail="Hash do bloco não confere com o anúncio.")
+
+    status = await receive_new_block(block=announcement.block,
+                                     sender=announcement.sender)
+    if status == 'invalid':
+        raise HTTPException(status_code=400, detail="Bloco inválido.")
+    if status in {'accepted', 'synced', 'known'}:
+        seen_blocks.add(block_hash)
+
+    response = {'message': 'Anúncio de bloco processado', 'status': status}
+    return response
+
+
+@router.get('/transaction_proof')
+def transaction_proof(block_index: int, transaction_hash: str):
+    """
+    Retorna a prova de Merkle de que a transação está incluída no bloco.
+    """
+    proof = get_transaction_proof(block_index=block_index, tx_hash=transaction_hash)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Transação não encontrada no bloco.")
+
+    response = {'message': 'Prova de inclusão da transação', **proof}
+    return response
@@ -1,10 +1,12 @@
-from fastapi import APIRouter
+import json
 
-from pycoin.blockchain.block_utils import load_chain
-from pycoin.schemas.schemas import AddTransaction, BalanceRequest
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from pycoin.schemas.schemas import AddTransaction, AddTransactionBatch, BalanceRequest
 from pycoin.settings.config import Settings
 from pycoin.transaction import Transaction
-from pycoin.wallet import Wallet
+from pycoin.wallet import Wallet, generate_wallets
 
 settings = Settings()
 router = APIRouter(prefix='/wallet', tags=['wallet'])
@@ -36,14 +38,34 @@ def generate_wallet():
         return response
 
 
-@router.post('/balance_and_transactions')
-def balance_and_transactions(request: BalanceRequest):
+def format_timestamp(moment):
+    # Mesmo formato dos timestamps gravados nos blocos e transações
+    return None if moment is None else str(moment.replace(tzinfo=None))
 
-    transaction = Transaction()
 
-    address_transaction = transaction.check_wallet_balance(
-        blockchain=load_chain(block_file_path=settings.BLOCKCHAIN_FILE),
-        wallet_address=request.address)
+@router.get('/generate_wallets')
+def generate_wallets_bulk(
+        count: int = Query(..., ge=1, le=settings.WALLET_GENERATION_MAX_COUNT)):
+    """
+    Gera count carteiras em paralelo e as envia em NDJSON (uma carteira por linha),
+    conforme ficam prontas.
+    """
+    lines = (json.dumps(wallet) + '\n' for wallet in generate_wallets(count))
+    return StreamingResponse(lines, media_type='application/x-ndjson')
+
+
+@router.post('/balance_and_transactions')
+def balance_and_transactions(request: BalanceRequest):
+    """
+    Retorna o saldo e o histórico paginado da carteira, do mais recente para o
+    mais antigo. Envie next_cursor como cursor para obter a próxima página.
+    """
+    address_transaction = Transaction().get_wallet_history(
+        wallet_address=request.address,
+        cursor=request.cursor,
+        limit=request.limit,
+        start_time=format_timestamp(request.start_time),
+        end_time=format_timestamp(request.end_time))
 
     return address_transaction
 
@@ -52,13 +74,30 @@ def balance_and_transactions(request: BalanceRequest):
 def add_transaction(add_transaction: AddTransaction):
 
     transaction = Transaction()
-    chain = load_chain(block_file_path=settings.BLOCKCHAIN_FILE)
     transaction.add_transaction(private_key_sender=add_transaction.private_key_sender,
                                 public_key_sender=add_transaction.public_key_sender,
                                 recipient_address=add_transaction.recipient_address,
                                 amount=add_transaction.amount,
-                                chain=chain)
+                                fee=add_transaction.fee)
 
     response = {'message': 'Nova transação adicionada'}
 
     return response
+
+
+@router.post('/add_transactions')
+def add_transactions(batch: AddTransactionBatch):
+    """
+    Adiciona várias transações de uma vez. Se alguma for inválida, nenhuma é adicionada.
+    """
+    transaction = Transaction()
+    added = transaction.add_transactions(
+        transfers=[transfer.model_dump() for transfer in batch.transactions])
+
+    response = {
+        'message': 'Novas transações adicionadas',
+        'count': len(added),
+        'ids': [transaction['id'] for transaction in added],
+    }
+
+    return response
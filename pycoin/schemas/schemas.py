@@ -1,13 +1,24 @@
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from pycoin.settings.config import Settings
+
+settings = Settings()
+
 
 class AddTransaction(BaseModel):
     private_key_sender: str
     public_key_sender: str
     recipient_address: str
     amount: float
+    fee: float = Field(0.0, ge=0)
+
+
+class AddTransactionBatch(BaseModel):
+    transactions: List[AddTransaction] = Field(
+        ..., min_length=1, max_length=settings.TRANSACTION_BATCH_MAX_SIZE)
 
 
 # Modelo de dados para um nó (endereço e porta)
@@ -27,7 +38,18 @@ class NodeListRequest(BaseModel):
     )
 
 
+# Anúncio de um único bloco enviado por outro nó para /miner/new_block
+class BlockAnnouncement(BaseModel):
+    block: Dict[str, Any]
+    sender: str = Field(..., example="127.0.0.1:8001")
+
+
 class BalanceRequest(BaseModel):
     address: str = Field(...,
         example="w3XKxU9J2deUzYgsFx5YTsZZg3Q="
     )
+    # Paginação do histórico: cursor retornado em next_cursor pela página anterior
+    cursor: Optional[str] = None
+    limit: int = Field(settings.WALLET_HISTORY_PAGE_SIZE, ge=1, le=500)
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
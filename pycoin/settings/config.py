@@ -16,6 +16,17 @@ class Settings(BaseSettings):
     NODES_FILE: Path = os.path.join(DATA_DIR, "nodes/nodes.json")
     TRANSACTIONS_FILE: Path = os.path.join(DATA_DIR, "transactions/transactions.json")
 
+    # Formato de armazenamento da blockchain: "json" (arquivo único) ou "log"
+    # (log somente de acréscimo com índice de offsets)
+    BLOCKCHAIN_STORAGE: str = "json"
+
+    # Persiste o mempool em um journal (transactions.journal) ao lado do arquivo
+    MEMPOOL_JOURNAL: bool = True
+    # O journal é reescrito com apenas as transações pendentes quando passa a ter
+    # mais que COMPACT_FACTOR vezes o número delas (e ao menos COMPACT_MIN registros)
+    MEMPOOL_JOURNAL_COMPACT_FACTOR: int = 4
+    MEMPOOL_JOURNAL_COMPACT_MIN: int = 1_000
+
     TEST_BLOCKCHAIN_FILE: Path = os.path.join(DATA_DIR, "blockchain/test_block.json")
     TEST_NODES_FILE: Path = os.path.join(DATA_DIR, "nodes/test_nodes.json")
     TEST_TRANSACTIONS_FILE: Path = os.path.join(DATA_DIR, "transactions/test_transactions.json")
@@ -41,10 +52,63 @@ class Settings(BaseSettings):
     PORT: int = 8000
     MY_NODE: str
 
+    # Comunicação entre nós: timeout (segundos), tamanho do pool de conexões
+    # e limite de requisições simultâneas
+    PEER_TIMEOUT: float = 5.0
+    PEER_MAX_CONNECTIONS: int = 100
+    PEER_MAX_CONCURRENCY: int = 20
+
+    # Verificação periódica dos nós (segundos) e espera máxima para reconsultar
+    # um nó que está offline
+    PEER_REFRESH_INTERVAL: float = 30.0
+    PEER_MAX_BACKOFF: float = 600.0
+
+    # Quantidade máxima de cabeçalhos/blocos retornados por página na sincronização
+    SYNC_PAGE_SIZE: int = 500
+
+    # Hashes de blocos já anunciados lembrados para descartar anúncios repetidos
+    GOSSIP_SEEN_MAX_SIZE: int = 10_000
+    GOSSIP_SEEN_TTL: float = 600.0
+
     # Configurações de mineração
     MINING_DIFFICULTY: int = 4
+    MINING_WORKERS: int = os.cpu_count() or 1
+    MINING_NONCE_CHUNK: int = 50_000
+
+    # Limites do bloco montado a partir do mempool (sem contar a recompensa)
+    BLOCK_MAX_BYTES: int = 1_000_000
+    BLOCK_MAX_TRANSACTIONS: int = 2_000
+
+    # Configurações de validação
+    VALIDATION_WORKERS: int = os.cpu_count() or 1
+    PARALLEL_VALIDATION_MIN_BLOCKS: int = 10_000
+
+    # Verificação de assinaturas: processos, tamanho mínimo do lote para usar
+    # o pool e quantidade de transações verificadas mantidas em cache
+    SIGNATURE_WORKERS: int = os.cpu_count() or 1
+    PARALLEL_SIGNATURE_MIN_TRANSACTIONS: int = 256
+    SIGNATURE_CACHE_SIZE: int = 100_000
     REWARD: float = 50.0
 
+    # Geração de carteiras em lote: processos, carteiras por tarefa e máximo por
+    # requisição
+    WALLET_GENERATION_WORKERS: int = os.cpu_count() or 1
+    WALLET_GENERATION_CHUNK: int = 500
+    WALLET_GENERATION_MAX_COUNT: int = 100_000
+
+    # Quantidade de chaves e endereços mantidos no cache da carteira
+    WALLET_KEY_CACHE_SIZE: int = 1024
+
+    # Confere o par de chaves pelos pontos públicos e assina uma única vez, sem
+    # as assinaturas de teste e a verificação após assinar
+    TRANSACTION_FAST_SIGNING: bool = True
+
+    # Quantidade máxima de transferências aceitas em um lote
+    TRANSACTION_BATCH_MAX_SIZE: int = 10_000
+
+    # Quantidade padrão de transações por página no histórico da carteira
+    WALLET_HISTORY_PAGE_SIZE: int = 50
+
     # Para garantir que a string será convertida em uma lista
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
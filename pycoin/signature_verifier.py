@@ -0,0 +1,170 @@
+import base64
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from pycoin.mempool import REWARD_SENDER, transaction_id
+from pycoin.settings.config import Settings
+from pycoin.wallet import Wallet
+
+settings = Settings()
+
+
+def signature_payload(address_sender: str, recipient_address: str, amount,
+                      fee=0, timestamp: str = '') -> bytes:
+    """
+    Dados assinados de uma transação (address_sender, recipient, amount, fee e
+    timestamp) com delimitadores.
+
+    O timestamp faz parte do id da transação; assiná-lo impede que uma
+    transferência confirmada seja reenviada com outro timestamp (e outro id).
+    """
+    payload = f'{address_sender}|{recipient_address}|{float(amount)}|{float(fee)}'
+    return f'{payload}|{timestamp}'.encode('utf-8')
+
+
+def verify_transaction_signature(transaction: dict) -> bool:
+    """
+    Verifica a assinatura de uma transação com a chave pública que ela carrega.
+
+    A chave também precisa corresponder ao endereço do remetente. Transações
+    malformadas (enviadas por outros nós) são consideradas inválidas.
+    """
+    if not isinstance(transaction, dict):
+        return False
+
+    address_sender = transaction.get('address_sender')
+    if address_sender == REWARD_SENDER:
+        return True
+
+    signature = transaction.get('signature')
+    public_key_string = transaction.get('public_key')
+    timestamp = transaction.get('timestamp')
+    if not address_sender or not signature or not timestamp \
+            or not isinstance(public_key_string, str):
+        return False
+
+    # Uma chave inválida não gera endereço, então também é rejeitada aqui
+    if Wallet.address_from_public_key_string(public_key_string) != address_sender:
+        return False
+
+    public_key = Wallet.load_public_key_from_string(public_key_string)
+    try:
+        public_key.verify(
+            base64.b64decode(signature),
+            signature_payload(address_sender, transaction.get('recipient_address'),
+                              transaction.get('amount'), transaction.get('fee', 0),
+                              timestamp),
+            ec.ECDSA(hashes.SHA256()),
+        )
+        return True
+    except (InvalidSignature, ValueError, TypeError):
+        return False
+
+
+def verify_transaction_signatures(transactions: list) -> bool:
+    """
+    Verifica as assinaturas de um trecho de transações (executado nos workers do pool).
+    """
+    return all(verify_transaction_signature(transaction) for transaction in transactions)
+
+
+class SignatureVerifier:
+    def __init__(self,
+                 workers: int = settings.SIGNATURE_WORKERS,
+                 min_parallel: int = settings.PARALLEL_SIGNATURE_MIN_TRANSACTIONS,
+                 cache_size: int = settings.SIGNATURE_CACHE_SIZE):
+        """
+        Verifica em lote as assinaturas das transações de um bloco ou do mempool.
+
+        Lotes grandes são divididos entre um pool de processos. Os ids das
+        transações já verificadas ficam em cache (LRU), então uma transação vista
+        no mempool não é verificada novamente quando chega dentro de um bloco.
+
+        :param workers: Quantidade de processos usados na verificação.
+        :param min_parallel: Quantidade mínima de assinaturas para usar o pool.
+        :param cache_size: Quantidade de ids verificados mantidos em cache.
+        """
+        self.workers = max(1, workers)
+        self.min_parallel = min_parallel
+        self.cache_size = cache_size
+        self._verified = OrderedDict()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def is_verified(self, tx_id: str) -> bool:
+        with self._lock:
+            if tx_id in self._verified:
+                self._verified.move_to_end(tx_id)
+                return True
+            return False
+
+    def mark_verified(self, tx_ids) -> None:
+        """
+        Registra transações cujas assinaturas já são conhecidas como válidas.
+        """
+        with self._lock:
+            for tx_id in tx_ids:
+                self._verified[tx_id] = None
+                self._verified.move_to_end(tx_id)
+            while len(self._verified) > self.cache_size:
+                self._verified.popitem(last=False)
+
+    def verify_many(self, transactions: list) -> bool:
+        """
+        Verifica as assinaturas de todas as transações informadas.
+
+        :return: True se todas forem válidas.
+        """
+        pending = {}
+        for transaction in transactions:
+            if not isinstance(transaction, dict):
+                return False
+            if transaction.get('address_sender') == REWARD_SENDER:
+                continue
+            tx_id = transaction_id(transaction)
+            if not self.is_verified(tx_id):
+                pending[tx_id] = transaction
+
+        if not pending:
+            return True
+
+        batch = list(pending.values())
+        if self.workers > 1 and len(batch) >= self.min_parallel:
+            chunk_size = -(-len(batch) // (self.workers * 4))
+            chunks = [batch[start:start + chunk_size]
+                      for start in range(0, len(batch), chunk_size)]
+            executor = self._get_executor()
+            is_valid = all(executor.map(verify_transaction_signatures, chunks))
+        else:
+            is_valid = verify_transaction_signatures(batch)
+
+        if is_valid:
+            self.mark_verified(pending)
+        return is_valid
+
+    def shutdown(self) -> None:
+        """
+        Encerra o pool de processos.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+@cache
+def get_signature_verifier() -> SignatureVerifier:
+    """
+    Retorna o verificador de assinaturas do processo, criando-o se necessário.
+    """
+    return SignatureVerifier()
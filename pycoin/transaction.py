@@ -1,22 +1,27 @@
+import base64
 import datetime
-import json
-from copy import deepcopy
+from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional
 
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurvePrivateKey
 
+from pycoin.blockchain.chain_store import get_chain_store
 from pycoin.exceptions.transaction_exceptions import TransactionError
+from pycoin.mempool import get_mempool, transaction_id
 from pycoin.settings.config import Settings
+from pycoin.signature_verifier import get_signature_verifier, signature_payload
 from pycoin.wallet import Wallet
 
 settings = Settings()
 # Tamanho truncado do endereço em bytes
 ADDRESS_LENGTH = 16  # 16 bytes (128 bits)
 CHECKSUM_LENGTH = 4  # Checksum de 4 bytes
+# Cursor do histórico: "altura:posição" da última transação da página
+CURSOR_PARTS = 2
 
 
 class Transaction:
@@ -31,24 +36,40 @@ class Transaction:
         """
 
         self.transactions_file_path = settings.TRANSACTIONS_FILE
+        self.block_file_path = settings.BLOCKCHAIN_FILE
+        # Timestamp gravado na transação, que também é assinado
+        self.timestamp = ''
 
     def sign_transaction(self, public_key: str, private_key: str,
-                         recipient_address: str, amount: float):
+                         recipient_address: str, amount: float, fee: float = 0.0):
         """
         Assina a transação usando a chave privada do remetente.
 
+        O timestamp da instância (self.timestamp) também é assinado.
+
+        Com TRANSACTION_FAST_SIGNING o par de chaves é conferido comparando os
+        pontos públicos e a transação é assinada uma única vez.
+
         :param private_key: A chave privada do remetente.
         :param public_key_sender: A chave pública correspondente.
+        :param fee: Taxa paga ao minerador (faz parte dos dados assinados).
         """
 
         # Converte
-        private_key = Wallet.load_private_key_from_string(key_string=private_key)
-        public_key = Wallet.load_public_key_from_string(key_string=public_key)
-
-        self.address_sender = Wallet.generate_address(public_key=public_key)
+        self.address_sender = Wallet.address_from_public_key_string(public_key)
+        if settings.TRANSACTION_FAST_SIGNING:
+            # Compara a chave pública derivada da privada, sem assinar
+            # (resultado em cache)
+            is_key_pair = Wallet.is_matching_key_pair(private_key, public_key)
+            private_key = Wallet.load_private_key_from_string(private_key)
+            public_key = Wallet.load_public_key_from_string(public_key)
+        else:
+            private_key = Wallet.load_private_key_from_string(private_key)
+            public_key = Wallet.load_public_key_from_string(public_key)
+            is_key_pair = Wallet.validate_key_pair(private_key=private_key,
+                                                   public_key=public_key)
 
-        if not Wallet.validate_key_pair(private_key=private_key,
-                                      public_key=public_key):
+        if not is_key_pair:
             raise ValueError('Chave privada e chave pública não correspondem.')
 
         if self.address_sender == recipient_address:
@@ -58,30 +79,39 @@ class Transaction:
             raise ValueError('O endereço do destinatário é invalido.')
 
         transaction_data = self._get_transaction_data(
-            self.address_sender, recipient_address, amount
+            self.address_sender, recipient_address, amount, fee, self.timestamp
         )
         self.signature = private_key.sign(
             transaction_data, ec.ECDSA(hashes.SHA256())
         )
 
-        if self.verify_signature(public_key, recipient_address, amount):
+        # Com o par de chaves conferido a assinatura não precisa ser verificada novamente
+        if settings.TRANSACTION_FAST_SIGNING:
+            return True
+
+        if self.verify_signature(public_key, recipient_address, amount,
+                                 address_sender=self.address_sender, fee=fee):
             return True
         else:
             raise ValueError('Transação inválida! A assinatura não corresponde.')
 
     def verify_signature(self, public_key: EllipticCurvePrivateKey,
-                         recipient_address: str, amount: float):
+                         recipient_address: str, amount: float,
+                         address_sender: Optional[str] = None, fee: float = 0.0):
         """
         Verifica a assinatura da transação usando a chave pública do remetente.
 
         :param public_key: A chave pública do remetente.
+        :param address_sender: Endereço do remetente, se já conhecido.
+        :param fee: Taxa informada na transação.
         :return: True se a assinatura for válida, False caso contrário.
         """
 
-        address_sender = Wallet.generate_address(public_key=public_key)
+        if address_sender is None:
+            address_sender = Wallet.generate_address(public_key=public_key)
 
         transaction_data = self._get_transaction_data(
-            address_sender, recipient_address, amount
+            address_sender, recipient_address, amount, fee, self.timestamp
         )
 
         try:
@@ -93,231 +123,307 @@ class Transaction:
             return False
 
     @staticmethod
-    def _get_transaction_data(address_sender, recipient_address, amount):
+    def _get_transaction_data(address_sender, recipient_address, amount, fee=0.0,
+                              timestamp=''):
         """
-        Concatena os dados da transação (address_sender, recipient, amount) em bytes
+        Concatena os dados da transação (address_sender, recipient, amount, fee,
+        timestamp) em bytes
 
         com delimitadores.
         :return: Dados da transação em formato binário.
         """
-        transaction_data = f'{address_sender}|{recipient_address}|{amount}'
-        return transaction_data.encode('utf-8')
-
-    @staticmethod
-    def _decode_transaction_data(transaction_data):
-        """
-        Decodifica os dados da transação de volta para address_sender, recipient e amount.
-        :param transaction_data: Dados binários da transação.
-        :return: Um dicionário com as informações da transação.
-        """
-        decoded_data = transaction_data.decode('utf-8')
-        address_sender, recipient_address, amount = decoded_data.split('|')
-
-        return {
-            'address_sender': address_sender,
-            'recipient_address': recipient_address,
-            'amount': float(amount),
-        }
+        return signature_payload(address_sender, recipient_address, amount, fee,
+                                 timestamp)
 
     @staticmethod
     def save_transactions(transactions_file_path: Path, transaction_data: list) -> bool:
         """
-        Salva as transações do arquivo JSON, mantendo a estrutura básica.
+        Adiciona as transações ao mempool, ignorando as já existentes (mesmo id).
         """
         print('Salvando transações')
 
         if not isinstance(transactions_file_path, Path):
             raise ValueError("O parâmetro transactions_file_path deve ser um objeto do tipo Path.")
 
-        existing_transaction = Transaction.load_transactions(transactions_file_path)
-        new_transaction = transaction_data + existing_transaction
-
-        # Adiciona a nova transação ao conjunto de transações existentes
-        transactions = {"transactions": new_transaction}
-
-        # Salva as transações atualizadas de volta ao arquivo
-        with open(transactions_file_path, 'w', encoding='utf-8') as file:
-            json.dump(transactions, file, indent=4)
+        get_mempool(transactions_file_path).add_many(transaction_data)
 
         return True
 
     @staticmethod
     def load_transactions(transactions_file_path: Path = settings.TRANSACTIONS_FILE) -> list:
         """
-        Carrega todas as transações do arquivo JSON, mantendo a estrutura básica.
+        Retorna as transações pendentes do mempool, em ordem de chegada.
         """
         print("Carregando transações")
         if not isinstance(transactions_file_path, Path):
             raise ValueError("O parâmetro block_file_path deve ser um objeto do tipo Path.")
 
-        if not transactions_file_path.exists():
-            transactions_file_path.parent.mkdir(parents=True, exist_ok=True)
-            transactions_file_path.touch()
-
-        if transactions_file_path.exists():
-            try:
-                with open(transactions_file_path, 'r', encoding='utf-8') as file:
-                    transaction = json.load(file)
-                    return transaction['transactions']
-            except json.JSONDecodeError:
-                print("Erro ao carregar o arquivo. Retornando lista vazia.")
-                return []
-            except Exception as e:
-                print(f"Error: {e}")
+        return get_mempool(transactions_file_path).snapshot()
 
     @staticmethod
-    def clear_transactions(transactions_file_path: str) -> bool:
+    def clear_transactions(transactions_file_path: Path) -> bool:
         """
-        Remove todas as transações do arquivo JSON.
+        Remove todas as transações do mempool.
         """
         print('Limpando transações')
 
-        # Define a estrutura vazia padrão
-        empty_transactions = {"transactions": []}
-
-        # Sobrescreve o arquivo com a estrutura vazia
-        with open(transactions_file_path, 'w', encoding='utf-8') as file:
-            json.dump(empty_transactions, file, indent=4)
+        get_mempool(Path(transactions_file_path)).clear()
 
         print(f"Todas as transações foram removidas de {transactions_file_path}.")
         return True
 
     @staticmethod
-    def add_transaction_miner_reward(miner_address: str,
-                                     reward_amount: float,
-                                     message_address: str = "MINING_REWARD"):
+    def create_miner_reward(miner_address: str,
+                            reward_amount: float,
+                            message_address: str = "MINING_REWARD") -> dict:
         """
-        Adiciona uma transação de recompensa para o minerador.
+        Cria a transação de recompensa do minerador, sem adicioná-la ao mempool.
         """
         if reward_amount <= 0:
             raise TransactionError('A recompensa deve ser maior que zero.', status_code=422)
 
-        # Cria a transação de recompensa
-        transaction_data = [{
+        return {
             'address_sender': message_address,  # Indicador especial para transações de recompensa
             'recipient_address': miner_address,
             'amount': float(reward_amount),
             'timestamp': str(datetime.datetime.now()),
-        }]
-
-        # Salva a transação diretamente
-        Transaction.save_transactions(transactions_file_path=settings.TRANSACTIONS_FILE,
-                                      transaction_data=transaction_data)
-
-        return True
-
-    def add_transaction(self, private_key_sender: str,
-                        public_key_sender: str,
-                        recipient_address: str,
-                        amount: float,
-                        chain: list):
+        }
 
-        # Verifica se a pessoa tem moedas necessarias
-        public_key = Wallet.load_public_key_from_string(key_string=public_key_sender)
-        address_sender = Wallet.generate_address(public_key)
-        wallet_balance = Transaction.check_wallet_balance(chain, wallet_address=address_sender)
+    def _build_transaction(self, transfer: dict,
+                           address_sender: str,
+                           wallet_balance: float,
+                           timestamp: datetime.datetime) -> dict:
+        """
+        Valida o valor e a taxa contra o saldo informado, assina e monta a transação.
 
+        :param transfer: Dicionário com private_key_sender, public_key_sender,
+            recipient_address, amount e opcionalmente fee.
+        """
+        public_key_sender = transfer['public_key_sender']
+        recipient_address = transfer['recipient_address']
+        amount = transfer['amount']
+        fee = transfer.get('fee', 0.0)
         if amount <= 0:
             raise TransactionError('Não é possivel realizar ransações negativas.',
             status_code=422)
-        if int(amount) >= int(wallet_balance['balance']):
+        if fee < 0:
+            raise TransactionError('A taxa não pode ser negativa.', status_code=422)
+        if int(amount + fee) >= int(wallet_balance):
             raise TransactionError('Saldo insuficiente para realizar a transação.',
             status_code=422)
 
-        print("Adicionando transição")
+        # Os valores e o timestamp assinados são os mesmos gravados na transação
+        self.timestamp = str(timestamp)
         self.sign_transaction(
-            private_key=private_key_sender,
+            private_key=transfer['private_key_sender'],
             public_key=public_key_sender,
-            recipient_address=recipient_address, amount=amount
+            recipient_address=recipient_address, amount=float(amount), fee=float(fee)
         )
 
-        transaction_data = [{
+        # Assinatura e chave pública permitem que outros nós verifiquem a transação
+        return {
             'address_sender': address_sender,
             'recipient_address': recipient_address,
             'amount': float(amount),
-            'timestamp': str(datetime.datetime.now())
-        }]
+            'fee': float(fee),
+            'timestamp': self.timestamp,
+            'signature': base64.b64encode(self.signature).decode('ascii'),
+            'public_key': public_key_sender,
+        }
+
+    def add_transaction(self, private_key_sender: str,
+                        public_key_sender: str,
+                        recipient_address: str,
+                        amount: float,
+                        fee: float = 0.0):
+
+        # Verifica se a pessoa tem moedas necessarias
+        address_sender = Wallet.address_from_public_key_string(public_key_sender)
+        wallet_balance = Transaction.get_wallet_balance(
+            wallet_address=address_sender,
+            block_file_path=self.block_file_path,
+            transactions_file_path=self.transactions_file_path)
+
+        print("Adicionando transição")
+        transaction_data = [self._build_transaction(
+            transfer={
+                'private_key_sender': private_key_sender,
+                'public_key_sender': public_key_sender,
+                'recipient_address': recipient_address,
+                'amount': amount,
+                'fee': fee,
+            },
+            address_sender=address_sender,
+            wallet_balance=wallet_balance,
+            timestamp=datetime.datetime.now(),
+        )]
 
         self.save_transactions(transactions_file_path=self.transactions_file_path,
                                 transaction_data=transaction_data)
+        get_signature_verifier().mark_verified(
+            transaction_id(transaction) for transaction in transaction_data)
 
         # previous_block = self.get_previous_block()
         # return previous_block['index'] + 1
         return True
 
-    @staticmethod
-    def calculate_balance_and_transactions(chain, wallet_address):
+    def add_transactions(self, transfers: list,
+                         block_file_path: Optional[Path] = None) -> list:
         """
-        Calcula o saldo e compila uma lista de transações relevantes para um endereço de carteira.
-        
-        :param chain: Blockchain contendo os blocos e suas transações.
-        :param wallet_address: Endereço da carteira para calcular saldo e transações.
-        :return: Dicionário contendo o saldo e as transações.
-        """
-        balance = 0
-        relevant_transactions = []
-
-        for block in chain:
-            block_timestamp = block.get('timestamp')
-            for transaction in block.get('transactions', []):
-                if wallet_address in (transaction.get('recipient_address'), transaction.get('address_sender')):
-                    amount = transaction.get('amount', 0)
-
-                    # Atualiza saldo baseado no tipo de transação
-                    if transaction.get('recipient_address') == wallet_address:
-                        balance += amount
-                    else:
-                        balance -= amount
-                        amount *= -1
-
-                    # Adiciona dados relevantes à transação
-                    transaction_info = {
-                        **transaction,
-                        "timestamp": block_timestamp,
-                        "amount": amount,
-                    }
-                    relevant_transactions.append(transaction_info)
+        Adiciona um lote de transações de forma atômica.
 
-        return {
-            'balance': balance,
-            'transactions': relevant_transactions
-        }
+        Os saldos são lidos uma única vez e descontados a cada transferência do
+        lote, então gastos acima do saldo dentro do próprio lote são detectados.
+        Se qualquer transferência for inválida nenhuma é adicionada; caso
+        contrário todas entram no mempool com uma única escrita.
 
-    @staticmethod
-    def check_wallet_balance(chain: List[Dict[str, Any]],
-                                wallet_address: str) -> Dict[str, Any]:
+        :param transfers: Lista de dicionários com private_key_sender,
+            public_key_sender, recipient_address, amount e opcionalmente fee.
+        :param block_file_path: Blockchain usada nos saldos. Por padrão a da instância.
+        :return: As transações adicionadas (com o campo id).
         """
-        Verifica o saldo e as transações de uma carteira.
-        
-        :param blockchain: Lista de blocos da blockchain.
-        :param wallet_address: Endereço da carteira a ser verificado.
-        :return: Dicionário contendo o saldo e as transações.
+        block_file_path = block_file_path or self.block_file_path
+        balances = {}
+        credits = defaultdict(float)
+        transactions = []
+        # Timestamps distintos evitam que transferências idênticas do lote tenham o
+        # mesmo id
+        started_at = datetime.datetime.now()
+
+        print(f"Adicionando lote de {len(transfers)} transações")
+        for position, transfer in enumerate(transfers):
+            public_key_sender = transfer['public_key_sender']
+            try:
+                address_sender = Wallet.address_from_public_key_string(public_key_sender)
+
+                if address_sender not in balances:
+                    balances[address_sender] = Transaction.get_wallet_balance(
+                        wallet_address=address_sender,
+                        block_file_path=block_file_path,
+                        transactions_file_path=self.transactions_file_path) \
+                        + credits.pop(address_sender, 0)
+
+                transaction = self._build_transaction(
+                    transfer=transfer,
+                    address_sender=address_sender,
+                    wallet_balance=balances[address_sender],
+                    timestamp=started_at + datetime.timedelta(microseconds=position),
+                )
+            except TransactionError as e:
+                raise TransactionError(f'Transação {position}: {e.detail}',
+                                       status_code=e.status_code)
+            except ValueError as e:
+                raise TransactionError(f'Transação {position}: {e}', status_code=422)
+
+            balances[address_sender] -= transaction['amount'] + transaction['fee']
+            # Valores recebidos dentro do lote também entram no saldo, como no mempool
+            if transaction['recipient_address'] in balances:
+                balances[transaction['recipient_address']] += transaction['amount']
+            else:
+                credits[transaction['recipient_address']] += transaction['amount']
+            transactions.append(transaction)
+
+        added = get_mempool(self.transactions_file_path).add_many(transactions)
+        get_signature_verifier().mark_verified(transaction['id'] for transaction in added)
+        return added
+
+    @staticmethod
+    def get_wallet_balance(
+            wallet_address: str,
+            block_file_path: Path = settings.BLOCKCHAIN_FILE,
+            transactions_file_path: Path = settings.TRANSACTIONS_FILE) -> float:
         """
+        Retorna o saldo de uma carteira em tempo constante.
 
-        transactions_in_file = Transaction.load_transactions()
+        Soma o saldo do índice da blockchain com as transações pendentes do mempool.
+        """
+        chain_store = get_chain_store(block_file_path)
+        len(chain_store)  # Garante que a cadeia e o índice de saldos estejam carregados
 
-        file_transactions_data = Transaction.calculate_balance_and_transactions(
-            [{'timestamp': t.get('timestamp'), 'transactions': [t]} for t in transactions_in_file],
-            wallet_address
-        )
+        return chain_store.balance_index.balance(wallet_address) \
+            + get_mempool(transactions_file_path).pending_balance(wallet_address)
 
-        # Processar transações na blockchain
-        blockchain_data = Transaction.calculate_balance_and_transactions(
-            deepcopy(chain),  # Remove deepcopy se não for necessário
-            wallet_address
-        )
+    @staticmethod
+    def _address_transaction(transaction: dict, wallet_address: str,
+                             timestamp: Optional[str],
+                             block_index: Optional[int]) -> dict:
+        amount = transaction.get('amount', 0)
+        if transaction.get('recipient_address') != wallet_address:
+            amount *= -1
 
-        # Combinar os resultados
-        combined_balance = file_transactions_data['balance'] + blockchain_data['balance']
-        combined_transactions = file_transactions_data['transactions'] + blockchain_data['transactions']
+        return {
+            **transaction,
+            'timestamp': timestamp,
+            'amount': amount,
+            'block_index': block_index,
+        }
 
-        # Ordenar transações por timestamp (opcional)
-        combined_transactions.sort(key=lambda tx: tx.get('timestamp', 0))
+    def get_wallet_history(self, wallet_address: str,
+                           cursor: Optional[str] = None,
+                           limit: int = settings.WALLET_HISTORY_PAGE_SIZE,
+                           start_time: Optional[str] = None,
+                           end_time: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Retorna o saldo e uma página do histórico de transações de uma carteira,
+        da mais recente para a mais antiga.
+
+        As transações confirmadas vêm do índice de endereços; a página e o
+        intervalo de tempo são localizados por busca binária. As transações
+        pendentes aparecem apenas na primeira página, antes das confirmadas.
+
+        :param cursor: Valor next_cursor da página anterior.
+        :param limit: Quantidade máxima de transações confirmadas na página.
+        :param start_time: Inclui apenas transações a partir deste instante.
+        :param end_time: Inclui apenas transações até este instante.
+        :return: Dicionário com o saldo, as transações e o cursor da próxima página.
+        """
+        before = None
+        if cursor is not None:
+            try:
+                before = tuple(int(part) for part in cursor.split(':'))
+            except ValueError:
+                raise TransactionError('Cursor inválido.', status_code=422)
+            if len(before) != CURSOR_PARTS:
+                raise TransactionError('Cursor inválido.', status_code=422)
+
+        chain_store = get_chain_store(self.block_file_path)
+        len(chain_store)  # Garante que a cadeia e o índice de saldos estejam carregados
+
+        min_height = 0 if start_time is None \
+            else chain_store.count_blocks_before(start_time)
+        max_height = None if end_time is None \
+            else chain_store.count_blocks_before(end_time, inclusive=True) - 1
+
+        references = chain_store.balance_index.history_page(
+            wallet_address, before=before, limit=limit,
+            min_height=min_height, max_height=max_height)
+
+        transactions = []
+        if cursor is None:
+            mempool = get_mempool(self.transactions_file_path)
+            pending = mempool.address_transactions(wallet_address)
+            for transaction in reversed(pending):
+                timestamp = transaction.get('timestamp', '')
+                if (start_time is None or timestamp >= start_time) \
+                        and (end_time is None or timestamp <= end_time):
+                    transactions.append(Transaction._address_transaction(
+                        transaction, wallet_address, timestamp, block_index=None))
+
+        for height, position in references:
+            block = chain_store.get_block(height)
+            transactions.append(Transaction._address_transaction(
+                block['transactions'][position], wallet_address,
+                block.get('timestamp'), block_index=height))
+
+        next_cursor = None
+        if references and len(references) == limit:
+            next_cursor = '{}:{}'.format(*references[-1])
 
-        # Resultado final combinado
-        final_data = {
-            'balance': combined_balance,
-            'transactions': combined_transactions
+        return {
+            'balance': Transaction.get_wallet_balance(
+                wallet_address=wallet_address,
+                block_file_path=self.block_file_path,
+                transactions_file_path=self.transactions_file_path),
+            'transactions': transactions,
+            'next_cursor': next_cursor,
         }
-
-        return final_data
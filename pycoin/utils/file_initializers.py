@@ -6,8 +6,8 @@ from pycoin.blockchain.block_utils import (
     create_genesis_block,
     save_blockchain,
     save_nodes,
-    update_blockchain,
 )
+from pycoin.blockchain.chain_store import get_chain_store
 from pycoin.settings.config import Settings
 
 settings = Settings()
@@ -51,15 +51,21 @@ def initialize_file(
 
 
 def initialize_blockchain_file(block_file_path: Path = settings.BLOCKCHAIN_FILE) -> bool:
+    """
+    Cria a blockchain com o bloco gênesis se ela ainda não existir.
+
+    A sincronização com os demais nós é assíncrona e fica a cargo do lifespan da
+    aplicação (ver BlockchainInitializer.is_blockchain_created).
+    """
     def init_blockchain(file_path: Path):
         print("Gerando bloco genesis")
         blockchain = create_genesis_block()
         save_blockchain(block_file_path=file_path, blockchain=blockchain)
 
+    # O arquivo verificado é o do armazenamento configurado (JSON ou log de blocos)
     return initialize_file(
-        file_path=block_file_path,
+        file_path=get_chain_store(block_file_path).storage.path,
         init_callback=init_blockchain,
-        update_callback=update_blockchain
     )
 
 
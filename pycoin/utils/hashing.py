@@ -0,0 +1,18 @@
+import hashlib
+import json
+from typing import Any
+
+
+def canonical_encode(data: Any) -> bytes:
+    """
+    Codifica dados em bytes de forma determinística.
+
+    Usa JSON com chaves ordenadas e sem espaços, independente da ordem de
+    inserção dos dicionários ou da representação do Python.
+    """
+    return json.dumps(data, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
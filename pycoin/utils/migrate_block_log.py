@@ -0,0 +1,46 @@
+"""
+Converte um block.json existente para o armazenamento em log de blocos.
+
+Uso:
+    python -m pycoin.utils.migrate_block_log [caminho/block.json] [--force]
+"""
+import argparse
+from pathlib import Path
+
+from pycoin.blockchain.block_log import BlockLog
+from pycoin.blockchain.chain_store import migrate_json_to_block_log
+from pycoin.settings.config import Settings
+
+settings = Settings()
+
+
+def migrate(block_file_path: Path = settings.BLOCKCHAIN_FILE, force: bool = False) -> int:
+    """
+    Gera os arquivos .log e .idx ao lado do block.json informado.
+
+    :param block_file_path: Caminho do block.json de origem.
+    :param force: Sobrescreve um log já existente.
+    :return: Quantidade de blocos migrados.
+    """
+    if not block_file_path.exists():
+        raise FileNotFoundError(
+            f"Arquivo da blockchain não encontrado: {block_file_path}")
+
+    block_log = BlockLog(block_file_path.with_suffix('.log'))
+    if block_log.exists() and len(block_log) and not force:
+        raise FileExistsError(
+            f"O log {block_log.path} já existe. Use --force para sobrescrever.")
+
+    return migrate_json_to_block_log(block_file_path, block_log)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Migra o block.json para o log de blocos.')
+    parser.add_argument('block_file', nargs='?', type=Path,
+                        default=settings.BLOCKCHAIN_FILE)
+    parser.add_argument('--force', action='store_true',
+                        help='Sobrescreve um log de blocos existente.')
+    args = parser.parse_args()
+
+    migrate(block_file_path=args.block_file, force=args.force)
@@ -1,11 +1,18 @@
 import base64
 import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterator
 
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurvePrivateKey
 
+from pycoin.settings.config import Settings
+
+settings = Settings()
+
 # Tamanho truncado do endereço em bytes
 ADDRESS_LENGTH = 16  # 16 bytes (128 bits)
 CHECKSUM_LENGTH = 4  # Checksum de 4 bytes
@@ -38,7 +45,9 @@ class Wallet:
         private_key_string = ''.join(private_key_pem.decode('utf-8').splitlines()[1:-1])
         public_key_string = ''.join(public_pem.decode('utf-8').splitlines()[1:-1])
 
-        return (private_key_string, public_key_string, self.generate_address(public_key))
+        # O PEM da chave pública já serializado é reaproveitado para o endereço
+        address = self.address_from_public_pem(public_pem)
+        return (private_key_string, public_key_string, address)
 
     @staticmethod
     def generate_keys():
@@ -59,6 +68,13 @@ class Wallet:
             format=serialization.PublicFormat.SubjectPublicKeyInfo,
         )
 
+        return Wallet.address_from_public_pem(public_bytes)
+
+    @staticmethod
+    def address_from_public_pem(public_bytes: bytes):
+        """
+        Gera o endereço a partir da chave pública já serializada em PEM.
+        """
         # Obter o hash da chave pública
         public_hash = hashlib.sha256(public_bytes).digest()
 
@@ -76,6 +92,22 @@ class Wallet:
 
         return encoded_address
 
+    @staticmethod
+    @lru_cache(maxsize=settings.WALLET_KEY_CACHE_SIZE)
+    def address_from_public_key_string(key_string):
+        """
+        Gera o endereço a partir da chave pública em uma única linha.
+
+        O resultado fica em cache (LRU) pela string da chave, evitando carregar e
+        serializar a chave novamente para remetentes frequentes.
+
+        :return: O endereço ou None se a chave for inválida.
+        """
+        public_key = Wallet.load_public_key_from_string(key_string)
+        if public_key is None:
+            return None
+        return Wallet.generate_address(public_key)
+
     @staticmethod
     def is_validate_address(encoded_address):
         """
@@ -98,11 +130,13 @@ class Wallet:
             return False
 
     @staticmethod
+    @lru_cache(maxsize=settings.WALLET_KEY_CACHE_SIZE)
     def load_private_key_from_string(key_string):
         """
         Carrega uma chave privada de uma string simplificada (sem marcações BEGIN/END)
 
-        para o formato PEM e a converte em um objeto.
+        para o formato PEM e a converte em um objeto. As chaves carregadas ficam
+        em cache (LRU) pela string; os objetos de chave são imutáveis.
         :param key_string: Chave privada em uma única linha (sem marcações BEGIN/END).
         :return: Objeto da chave privada.
         """
@@ -122,11 +156,13 @@ class Wallet:
             return None
 
     @staticmethod
+    @lru_cache(maxsize=settings.WALLET_KEY_CACHE_SIZE)
     def load_public_key_from_string(key_string):
         """
         Carrega uma chave pública de uma string simplificada (sem marcações BEGIN/END)
 
-        para o formato PEM e a converte em um objeto.
+        para o formato PEM e a converte em um objeto. As chaves carregadas ficam
+        em cache (LRU) pela string; os objetos de chave são imutáveis.
         :param key_string: Chave pública em uma única linha (sem marcações BEGIN/END).
         :return: Objeto da chave pública.
         """
@@ -145,6 +181,27 @@ class Wallet:
             print(f'Erro ao carregar chave pública: {e}')
             return None
 
+    @staticmethod
+    @lru_cache(maxsize=settings.WALLET_KEY_CACHE_SIZE)
+    def is_matching_key_pair(private_key_string, public_key_string):
+        """
+        Verifica, sem assinar, se a chave pública corresponde à chave privada.
+
+        Compara o ponto público derivado da chave privada com o ponto da chave
+        pública informada. O resultado fica em cache (LRU) pelo par de strings.
+
+        :return: True se as chaves forem correspondentes, False caso contrário.
+        """
+        private_key = Wallet.load_private_key_from_string(private_key_string)
+        public_key = Wallet.load_public_key_from_string(public_key_string)
+        if private_key is None or public_key is None:
+            return False
+
+        encoding = serialization.Encoding.X962
+        point_format = serialization.PublicFormat.UncompressedPoint
+        return private_key.public_key().public_bytes(encoding, point_format) \
+            == public_key.public_bytes(encoding, point_format)
+
     @staticmethod
     def validate_key_pair(private_key, public_key):
         """
@@ -163,3 +220,51 @@ class Wallet:
             return True
         except InvalidSignature:
             return False
+
+
+def generate_wallet_batch(count: int) -> list:
+    """
+    Gera count carteiras (executado dentro dos processos do pool).
+
+    :return: Lista de dicionários com private_key, public_key e address.
+    """
+    wallet = Wallet()
+    wallets = []
+    for _ in range(count):
+        private_key, public_key, address = wallet.generate_strings_key_no_markers()
+        wallets.append({'private_key': private_key, 'public_key': public_key,
+                        'address': address})
+    return wallets
+
+
+def generate_wallets(
+        count: int,
+        workers: int = settings.WALLET_GENERATION_WORKERS,
+        chunk_size: int = settings.WALLET_GENERATION_CHUNK) -> Iterator[dict]:
+    """
+    Gera count carteiras distribuindo a derivação das chaves entre um pool de processos.
+
+    As carteiras são produzidas conforme ficam prontas e apenas alguns lotes
+    ficam em andamento ao mesmo tempo, então a memória usada não depende de count.
+
+    :param workers: Quantidade de processos usados.
+    :param chunk_size: Quantidade de carteiras geradas por tarefa do pool.
+    """
+    chunk_size = max(1, chunk_size)
+    chunks = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from generate_wallet_batch(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Mantém no máximo dois lotes por worker em andamento
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(generate_wallet_batch, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+
+        for future in pending:
+            yield from future.result()
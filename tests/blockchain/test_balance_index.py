@@ -0,0 +1,82 @@
+from pycoin.blockchain.balance_index import BalanceIndex
+
+ADDRESS_A = 'pum7mQtJqClnNuMIPxCwZSWJkE4='
+ADDRESS_B = 'G7j6UydY3hNM-SzpRxyzIJf1I3M='
+REWARD = 50.0
+SENT = 20.0
+FORK_SENT = 5.0
+
+
+def make_block(index: int, transactions: list, block_hash: str = None) -> dict:
+    return {
+        'index': index,
+        'hash': block_hash or f'hash-{index}',
+        'transactions': transactions,
+    }
+
+
+def transfer(sender: str, recipient: str, amount: float) -> dict:
+    return {'address_sender': sender, 'recipient_address': recipient, 'amount': amount}
+
+
+def make_chain() -> list:
+    return [
+        make_block(0, []),
+        make_block(1, [transfer('MINING_REWARD', ADDRESS_A, REWARD)]),
+        make_block(2, [transfer(ADDRESS_A, ADDRESS_B, SENT)]),
+    ]
+
+
+def test_balance_index_applies_blocks():
+    balance_index = BalanceIndex()
+    balance_index.sync(make_chain())
+
+    assert balance_index.balance(ADDRESS_A) == REWARD - SENT
+    assert balance_index.balance(ADDRESS_B) == SENT
+    assert balance_index.history(ADDRESS_A) == [(1, 0), (2, 0)]
+
+
+def test_balance_index_rewinds_replaced_blocks():
+    balance_index = BalanceIndex()
+    balance_index.sync(make_chain())
+
+    fork = make_chain()[:2] + [
+        make_block(2, [transfer(ADDRESS_A, ADDRESS_B, FORK_SENT)], block_hash='fork-2'),
+        make_block(3, [], block_hash='fork-3'),
+    ]
+    balance_index.sync(fork)
+
+    assert balance_index.height == len(fork) - 1
+    assert balance_index.balance(ADDRESS_A) == REWARD - FORK_SENT
+    assert balance_index.balance(ADDRESS_B) == FORK_SENT
+    assert balance_index.history(ADDRESS_B) == [(2, 0)]
+
+
+def test_balance_index_is_persisted(tmp_path):
+    index_file = tmp_path / 'block.balances'
+    balance_index = BalanceIndex(index_file)
+    balance_index.sync(make_chain())
+    balance_index.rewind(2)
+
+    reloaded = BalanceIndex(index_file)
+
+    assert reloaded.height == 1
+    assert reloaded.balance(ADDRESS_A) == REWARD
+    assert reloaded.balance(ADDRESS_B) == 0
+
+
+def test_history_page_is_newest_first_with_cursor():
+    chain = [make_block(0, [])] + [
+        make_block(height, [transfer('MINING_REWARD', ADDRESS_A, 1.0)] * 2)
+        for height in range(1, 6)
+    ]
+    balance_index = BalanceIndex()
+    balance_index.sync(chain)
+
+    first_page = balance_index.history_page(ADDRESS_A, limit=3)
+    second_page = balance_index.history_page(ADDRESS_A, before=first_page[-1], limit=3)
+
+    assert first_page == [(5, 1), (5, 0), (4, 1)]
+    assert second_page == [(4, 0), (3, 1), (3, 0)]
+    assert balance_index.history_page(ADDRESS_A, limit=10, min_height=2, max_height=3) \
+        == [(3, 1), (3, 0), (2, 1), (2, 0)]
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from pycoin.blockchain import block_utils
+from pycoin.blockchain.block_utils import (
+    check_progagate_blockchain,
+    create_block,
+    create_genesis_block,
+    receive_new_block,
+)
+from pycoin.blockchain.chain_store import get_chain_store
+from pycoin.miner.mining_utils import chain_tip_signal, search_nonce_range
+from pycoin.network.peer_manager import PeerManager
+from pycoin.settings.config import Settings
+from tests.conftest import DIFFICULTY, mine_chain
+
+settings = Settings()
+
+
+@pytest.fixture
+def announcements(monkeypatch):
+    announced = []
+    monkeypatch.setattr(block_utils, 'peer_manager',
+                        PeerManager(load_nodes=lambda: ['a:8000', 'b:8000']))
+    monkeypatch.setattr(block_utils, 'propagate_new_block',
+                        lambda block, nodes, exclude=(): announced.append(
+                            (block['index'], exclude)))
+    return announced
+
+
+@pytest.fixture
+def synced(monkeypatch):
+    calls = []
+
+    async def fake_sync_from_peer(node, block_file_path, difficulty):
+        calls.append(node)
+        return False
+
+    monkeypatch.setattr(block_utils, 'sync_from_peer', fake_sync_from_peer)
+    return calls
+
+
+def receive(block, block_file_path):
+    return asyncio.run(receive_new_block(block, sender='a:8000',
+                                         block_file_path=block_file_path,
+                                         difficulty=DIFFICULTY))
+
+
+def test_block_extending_tip_is_appended_and_relayed(tmp_path, announcements, synced):
+    chain = mine_chain(create_genesis_block(), 4)
+    block_file_path = tmp_path / 'block.json'
+    get_chain_store(block_file_path).replace(chain[:3])
+    generation = chain_tip_signal.generation
+
+    assert receive(chain[3], block_file_path) == 'accepted'
+    assert get_chain_store(block_file_path).get_chain() == chain
+    # A mineração sobre a ponta anterior é abortada
+    assert chain_tip_signal.is_stale(generation)
+    assert announcements == [(3, ('a:8000',))]
+    assert synced == []
+
+    # Um anúncio repetido não é reprocessado nem repassado
+    assert receive(chain[3], block_file_path) == 'known'
+    assert len(announcements) == 1
+
+
+def test_invalid_block_is_rejected(tmp_path, announcements, synced):
+    chain = mine_chain(create_genesis_block(), 4)
+    block_file_path = tmp_path / 'block.json'
+    get_chain_store(block_file_path).replace(chain[:3])
+
+    tampered = dict(chain[3], proof=chain[3]['proof'] + 1)
+    assert receive(tampered, block_file_path) == 'invalid'
+    assert get_chain_store(block_file_path).get_chain() == chain[:3]
+    assert announcements == []
+
+
+def test_gap_triggers_sync_from_sender(tmp_path, announcements, synced):
+    chain = mine_chain(create_genesis_block(), 6)
+    block_file_path = tmp_path / 'block.json'
+    get_chain_store(block_file_path).replace(chain[:3])
+
+    assert receive(chain[5], block_file_path) == 'ignored'
+    assert synced == ['a:8000']
+    assert get_chain_store(block_file_path).get_chain() == chain[:3]
+
+
+def test_gap_from_unknown_sender_is_not_synced(tmp_path, announcements, synced):
+    chain = mine_chain(create_genesis_block(), 6)
+    block_file_path = tmp_path / 'block.json'
+    get_chain_store(block_file_path).replace(chain[:3])
+
+    status = asyncio.run(receive_new_block(chain[5], sender='intruso:8000',
+                                           block_file_path=block_file_path,
+                                           difficulty=DIFFICULTY))
+
+    assert status == 'ignored'
+    assert synced == []
+
+
+def test_stale_block_is_ignored(tmp_path, announcements, synced):
+    chain = mine_chain(create_genesis_block(), 4)
+    block_file_path = tmp_path / 'block.json'
+    get_chain_store(block_file_path).replace(chain)
+    other = mine_chain(create_genesis_block(), 3)
+
+    assert receive(other[2], block_file_path) == 'ignored'
+    assert synced == []
+
+
+def test_legacy_chain_push_listing_receiver_is_processed(tmp_path, announcements):
+    genesis = create_genesis_block()
+    # A rota antiga valida com a dificuldade padrão
+    chain = genesis + [create_block(
+        index=1,
+        proof=search_nonce_range(genesis[-1]['proof'], 4, 1, 10**7),
+        previous_hash=genesis[-1]['hash'],
+        transactions=[],
+    )]
+    block_file_path = tmp_path / 'block.json'
+    get_chain_store(block_file_path).replace(genesis)
+
+    # Nós antigos enviam LIST_NODE_VALID, que inclui o próprio receptor
+    response = asyncio.run(check_progagate_blockchain(
+        chain, nodes_updated=[settings.MY_NODE], block_file_path=block_file_path))
+
+    assert response['new_blockchain'] == chain
+    assert get_chain_store(block_file_path).get_chain() == chain
+    assert announcements == [(1, ())]
@@ -0,0 +1,76 @@
+import json
+
+from pycoin.blockchain.block_log import BlockLog
+from pycoin.blockchain.chain_store import ChainStore
+from pycoin.utils.migrate_block_log import migrate
+
+
+def make_chain(length: int) -> list:
+    return [{
+        'index': index,
+        'timestamp': f'2024-11-26 07:00:{index:02d}.000000',
+        'previous_hash': str(index - 1),
+        'hash': str(index),
+        'proof': index,
+        'transactions': [],
+    } for index in range(length)]
+
+
+def test_block_log_reads_block_by_index(tmp_path):
+    chain = make_chain(5)
+    block_log = BlockLog(tmp_path / 'block.log')
+    block_log.rewrite(chain)
+
+    reopened = BlockLog(tmp_path / 'block.log')
+
+    assert len(reopened) == len(chain)
+    assert reopened.read(3) == chain[3]
+    assert reopened.load() == chain
+
+
+def test_block_log_append_writes_only_new_record(tmp_path):
+    chain = make_chain(3)
+    block_log = BlockLog(tmp_path / 'block.log')
+    block_log.rewrite(chain[:2])
+    content_before = block_log.path.read_bytes()
+
+    block_log.append(chain)
+
+    content_after = block_log.path.read_bytes()
+    assert content_after.startswith(content_before)
+    assert json.loads(content_after[len(content_before):]) == chain[2]
+
+
+def test_block_log_discards_incomplete_record(tmp_path):
+    chain = make_chain(3)
+    block_log = BlockLog(tmp_path / 'block.log')
+    block_log.rewrite(chain)
+
+    with open(block_log.path, 'ab') as file:
+        file.write(b'{"index":3,"timest')
+
+    reopened = BlockLog(tmp_path / 'block.log')
+
+    assert reopened.load() == chain
+
+
+def test_block_log_rewrite_keeps_common_prefix(tmp_path):
+    chain = make_chain(4)
+    fork = chain[:2] + [dict(block, proof=99, hash=f"fork-{block['index']}")
+                       for block in chain[2:]]
+    chain_store = ChainStore(block_file_path=tmp_path / 'block.json',
+                             storage=BlockLog(tmp_path / 'block.log'))
+    chain_store.replace(chain)
+
+    chain_store.replace(fork)
+
+    assert BlockLog(tmp_path / 'block.log').load() == fork
+
+
+def test_migrate_block_json(tmp_path):
+    chain = make_chain(4)
+    block_file = tmp_path / 'block.json'
+    block_file.write_text(json.dumps(chain, indent=4), encoding='utf-8')
+
+    assert migrate(block_file_path=block_file) == len(chain)
+    assert BlockLog(tmp_path / 'block.log').load() == chain
@@ -1,9 +1,7 @@
 
 
-import datetime
-
 from pycoin.blockchain.block_utils import (
-    calculate_hash,
+    create_block,
     get_previous_block,
     load_chain,
     proof_of_work,
@@ -23,18 +21,18 @@ async def test_start_block_mining():
 
     chain = load_chain(block_file_path=settings.TEST_BLOCKCHAIN_FILE)
 
-    transaction.add_transaction_miner_reward(
+    # A recompensa é criada no próprio bloco, fora do mempool
+    reward = Transaction.create_miner_reward(
             miner_address=settings.TEST_MINER_PUBLIC_ADDRESS,
             reward_amount=settings.MINING_REWARD)
 
-    block = {
-            'index': len(chain),
-            'timestamp': str(datetime.datetime.now()),
-            'proof': proof,
-            'hash': calculate_hash(previous_block),
-            'previous_hash': previous_block['hash'],
-            'transactions': transaction.load_transactions(transaction.transactions_file_path),
-        }
+    block = create_block(
+            index=len(chain),
+            proof=proof,
+            previous_hash=previous_block['hash'],
+            transactions=[reward, *transaction.load_transactions(
+                transaction.transactions_file_path)],
+        )
 
     assert transaction.clear_transactions(transaction.transactions_file_path)
 
@@ -0,0 +1,60 @@
+import json
+
+from pycoin.blockchain.block_utils import create_genesis_block
+from pycoin.blockchain.chain_store import ChainStore, get_chain_store
+
+
+def make_block(previous_block: dict) -> dict:
+    return {
+        'index': previous_block['index'] + 1,
+        'timestamp': '2024-11-26 07:00:00.000000',
+        'previous_hash': previous_block['hash'],
+        'hash': f"hash-{previous_block['index'] + 1}",
+        'proof': 1,
+        'transactions': [],
+    }
+
+
+def test_chain_store_reads_file_once(tmp_path):
+    block_file = tmp_path / 'block.json'
+    genesis = create_genesis_block()
+    block_file.write_text(json.dumps(genesis), encoding='utf-8')
+
+    chain_store = ChainStore(block_file_path=block_file)
+    assert chain_store.get_chain() == genesis
+
+    block_file.write_text(json.dumps([]), encoding='utf-8')
+
+    assert chain_store.get_chain() == genesis
+    assert chain_store.tip() == genesis[0]
+
+
+def test_chain_store_append_block_persists(tmp_path):
+    block_file = tmp_path / 'block.json'
+    chain_store = ChainStore(block_file_path=block_file)
+    chain_store.replace(create_genesis_block())
+
+    block = make_block(chain_store.tip())
+
+    assert chain_store.append_block(block)
+    assert chain_store.tip() == block
+
+    with open(block_file, 'r', encoding='utf-8') as file:
+        assert json.load(file)[-1] == block
+
+
+def test_chain_store_rejects_block_off_tip(tmp_path):
+    chain_store = ChainStore(block_file_path=tmp_path / 'block.json')
+    chain_store.replace(create_genesis_block())
+
+    block = make_block(chain_store.tip())
+    block['previous_hash'] = 'outra-ponta'
+
+    assert not chain_store.append_block(block)
+    assert len(chain_store) == 1
+
+
+def test_get_chain_store_is_shared_per_file(tmp_path):
+    block_file = tmp_path / 'block.json'
+
+    assert get_chain_store(block_file) is get_chain_store(block_file)
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+
+import pytest
+
+from pycoin.blockchain import block_utils
+from pycoin.blockchain.block_utils import (
+    calculate_hash,
+    create_block,
+    create_genesis_block,
+    find_fork_point,
+    is_block_valid,
+    is_chain_valid,
+    validate_candidate_chain,
+    validate_local_chain,
+)
+from pycoin.blockchain.chain_store import get_chain_store
+from pycoin.miner.mining_utils import search_nonce_range
+from tests.conftest import DIFFICULTY, mine_chain
+
+
+@pytest.fixture
+def count_block_checks(monkeypatch):
+    checked = []
+    is_block_valid = block_utils.is_block_valid
+
+    def counting_is_block_valid(previous_block, block, difficulty=4):
+        checked.append(block['index'])
+        return is_block_valid(previous_block, block, difficulty=difficulty)
+
+    monkeypatch.setattr(block_utils, 'is_block_valid', counting_is_block_valid)
+    return checked
+
+
+def test_is_chain_valid_detects_tampered_block():
+    chain = mine_chain(create_genesis_block(), 4)
+    chain[2] = dict(chain[2], proof=chain[2]['proof'] + 1)
+
+    assert not is_chain_valid(chain, difficulty=DIFFICULTY)
+
+
+def test_is_chain_valid_detects_tampered_transactions():
+    chain = mine_chain(create_genesis_block(), 3)
+    chain[1] = dict(chain[1], transactions=[{'amount': 1_000_000.0}])
+
+    assert not is_chain_valid(chain, difficulty=DIFFICULTY)
+
+
+def test_block_hash_is_canonical():
+    block = create_genesis_block()[0]
+    reordered = dict(reversed(list(block.items())))
+
+    assert calculate_hash(reordered) == block['hash']
+
+
+def test_find_fork_point():
+    chain = mine_chain(create_genesis_block(), 5)
+    common = chain[:3]
+    fork = mine_chain(common, 6)
+
+    assert find_fork_point(chain, fork) == len(common)
+    assert find_fork_point(chain, chain) == len(chain)
+    assert find_fork_point(chain, create_genesis_block()) == 0
+
+
+def test_validate_local_chain_checks_only_new_blocks(tmp_path, count_block_checks):
+    block_file = tmp_path / 'block.json'
+    chain_store = get_chain_store(block_file)
+    chain_store.replace(mine_chain(create_genesis_block(), 4))
+
+    assert validate_local_chain(block_file_path=block_file, difficulty=DIFFICULTY)
+    assert count_block_checks == [1, 2, 3]
+    assert chain_store.validated_height == len(chain_store) - 1
+
+    chain_store.replace(mine_chain(chain_store.get_chain(), 5))
+    count_block_checks.clear()
+
+    assert validate_local_chain(block_file_path=block_file, difficulty=DIFFICULTY)
+    assert count_block_checks == [4]
+
+
+def test_validate_candidate_chain_checks_from_fork_point(tmp_path, count_block_checks):
+    block_file = tmp_path / 'block.json'
+    chain_store = get_chain_store(block_file)
+    chain = mine_chain(create_genesis_block(), 5)
+    chain_store.replace(chain, is_validated=True)
+
+    candidate = mine_chain(chain[:3], 7)
+    count_block_checks.clear()
+
+    assert validate_candidate_chain(candidate, block_file_path=block_file,
+                                    difficulty=DIFFICULTY) == candidate
+    assert count_block_checks == [3, 4, 5, 6]
+
+
+def test_parallel_validation(monkeypatch):
+    monkeypatch.setattr(block_utils.settings, 'PARALLEL_VALIDATION_MIN_BLOCKS', 2)
+    chain = mine_chain(create_genesis_block(), 12)
+
+    assert is_chain_valid(chain, difficulty=DIFFICULTY, workers=2)
+
+    chain[7] = dict(chain[7], proof=chain[7]['proof'] + 1)
+
+    assert not is_chain_valid(chain, difficulty=DIFFICULTY, workers=2)
+
+
+def test_is_block_valid_rejects_duplicated_transactions():
+    genesis = create_genesis_block()
+    transactions = [{'address_sender': 'MINING_REWARD', 'recipient_address': address,
+                     'amount': 50.0, 'timestamp': '2024-01-01 00:00:00'}
+                    for address in ('a', 'b', 'minerador')]
+    block = create_block(
+        index=1,
+        proof=search_nonce_range(genesis[-1]['proof'], DIFFICULTY, 1, 10**6),
+        previous_hash=genesis[-1]['hash'],
+        transactions=transactions,
+    )
+    # Repetir a última transação mantém a raiz de Merkle e o hash do bloco
+    mutated = dict(block, transactions=transactions + [transactions[-1]])
+
+    assert calculate_hash(mutated) == block['hash']
+    assert is_block_valid(genesis[-1], block, difficulty=DIFFICULTY)
+    assert not is_block_valid(genesis[-1], mutated, difficulty=DIFFICULTY)
+
+
+def test_is_block_valid_rejects_inconsistent_header():
+    genesis = create_genesis_block()
+    proof = search_nonce_range(genesis[-1]['proof'], DIFFICULTY, 1, 10**6)
+
+    def make_block(index, block_proof):
+        return create_block(index=index, proof=block_proof,
+                            previous_hash=genesis[-1]['hash'], transactions=[])
+
+    assert is_block_valid(genesis[-1], make_block(1, proof), difficulty=DIFFICULTY)
+    # A prova de trabalho não depende do índice, que é a altura usada na sincronização
+    assert not is_block_valid(genesis[-1], make_block(999, proof), difficulty=DIFFICULTY)
+    assert not is_block_valid(genesis[-1], make_block(1, None), difficulty=DIFFICULTY)
+
+
+def test_start_block_mining_validates_outside_event_loop(tmp_path, monkeypatch):
+    block_file_path = tmp_path / 'block.json'
+    get_chain_store(block_file_path).replace(create_genesis_block())
+    validation_threads = []
+
+    async def found_proof(previous_proof, generation=None):
+        return 1
+
+    async def skip_update(block_file_path):
+        return None
+
+    def record_validation(block_file_path):
+        validation_threads.append(threading.current_thread())
+        return False
+
+    monkeypatch.setattr(block_utils, 'proof_of_work', found_proof)
+    monkeypatch.setattr(block_utils, 'validate_local_chain', record_validation)
+    monkeypatch.setattr(block_utils, 'update_blockchain', skip_update)
+
+    assert asyncio.run(block_utils.start_block_mining(
+        block_file_path=block_file_path,
+        transactions_file_path=tmp_path / 'transactions.json')) is False
+    assert validation_threads
+    assert validation_threads[0] is not threading.main_thread()
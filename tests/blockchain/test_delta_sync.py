@@ -0,0 +1,118 @@
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+
+from pycoin.blockchain import block_utils
+from pycoin.blockchain.block_utils import (
+    create_genesis_block,
+    get_block_headers,
+    get_blocks_page,
+    get_chain_tip,
+    sync_from_peer,
+)
+from pycoin.blockchain.chain_store import get_chain_store
+from pycoin.network.peer_client import PeerClient
+from tests.conftest import DIFFICULTY, mine_chain
+
+
+def serve_chain(remote_path, requests_log: list) -> PeerClient:
+    """
+    Cliente cujas requisições são respondidas pela cadeia armazenada em remote_path.
+    """
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = {key: int(values[0])
+                  for key, values in parse_qs(request.url.query.decode()).items()}
+        requests_log.append((request.url.path, params))
+
+        if request.url.path == '/miner/tip':
+            return httpx.Response(200, json=get_chain_tip(remote_path))
+        if request.url.path == '/miner/headers':
+            return httpx.Response(200, json={'headers': get_block_headers(
+                block_file_path=remote_path, **params)})
+        if request.url.path == '/miner/blocks':
+            return httpx.Response(200, json={'blocks': get_blocks_page(
+                block_file_path=remote_path, **params)})
+        return httpx.Response(404)
+
+    return PeerClient(transport=httpx.MockTransport(handler))
+
+
+def run_sync(local_path, remote_path, requests_log: list) -> bool:
+    async def run():
+        async with serve_chain(remote_path, requests_log) as client:
+            return await sync_from_peer('peer:8000', block_file_path=local_path,
+                                        difficulty=DIFFICULTY, client=client)
+
+    return asyncio.run(run())
+
+
+def downloaded_heights(requests_log: list) -> list:
+    return [params['from_height'] for path, params in requests_log
+            if path == '/miner/blocks']
+
+
+def test_sync_downloads_only_missing_suffix(tmp_path):
+    local_chain = mine_chain(create_genesis_block(), 20)
+    remote_chain = mine_chain(local_chain, 25)
+    get_chain_store(tmp_path / 'local.json').replace(local_chain)
+    get_chain_store(tmp_path / 'remote.json').replace(remote_chain)
+
+    requests_log = []
+    assert run_sync(tmp_path / 'local.json', tmp_path / 'remote.json', requests_log)
+
+    assert get_chain_store(tmp_path / 'local.json').get_chain() == remote_chain
+    assert downloaded_heights(requests_log) == [20]
+    # Apenas a ponta local foi comparada
+    assert len([path for path, _ in requests_log if path == '/miner/headers']) == 1
+
+
+def test_sync_finds_fork_point(tmp_path):
+    common_chain = mine_chain(create_genesis_block(), 12)
+    local_chain = mine_chain(common_chain, 16)
+    remote_chain = mine_chain(common_chain, 18, transactions=[
+        {'address_sender': 'MINING_REWARD', 'recipient_address': 'x', 'amount': 1.0}])
+    get_chain_store(tmp_path / 'local.json').replace(local_chain)
+    get_chain_store(tmp_path / 'remote.json').replace(remote_chain)
+
+    requests_log = []
+    assert run_sync(tmp_path / 'local.json', tmp_path / 'remote.json', requests_log)
+
+    assert get_chain_store(tmp_path / 'local.json').get_chain() == remote_chain
+    assert downloaded_heights(requests_log) == [12]
+
+
+def test_sync_without_common_ancestor_downloads_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(block_utils.settings, 'SYNC_PAGE_SIZE', 4)
+
+    local_chain = mine_chain(create_genesis_block(), 3)
+    remote_chain = mine_chain(create_genesis_block(), 10)
+    get_chain_store(tmp_path / 'local.json').replace(local_chain)
+    get_chain_store(tmp_path / 'remote.json').replace(remote_chain)
+
+    requests_log = []
+    assert run_sync(tmp_path / 'local.json', tmp_path / 'remote.json', requests_log)
+
+    assert get_chain_store(tmp_path / 'local.json').get_chain() == remote_chain
+    assert sorted(downloaded_heights(requests_log)) == [0, 4, 8]
+
+
+def test_sync_rejects_invalid_suffix(tmp_path):
+    local_chain = mine_chain(create_genesis_block(), 5)
+    remote_chain = mine_chain(local_chain, 8)
+    remote_chain[6] = dict(remote_chain[6], proof=remote_chain[6]['proof'] + 1)
+    get_chain_store(tmp_path / 'local.json').replace(local_chain)
+    get_chain_store(tmp_path / 'remote.json').replace(remote_chain)
+
+    assert not run_sync(tmp_path / 'local.json', tmp_path / 'remote.json', [])
+    assert get_chain_store(tmp_path / 'local.json').get_chain() == local_chain
+
+
+def test_sync_ignores_shorter_peer(tmp_path):
+    local_chain = mine_chain(create_genesis_block(), 5)
+    get_chain_store(tmp_path / 'local.json').replace(local_chain)
+    get_chain_store(tmp_path / 'remote.json').replace(local_chain[:3])
+
+    requests_log = []
+    assert not run_sync(tmp_path / 'local.json', tmp_path / 'remote.json', requests_log)
+    assert requests_log == [('/miner/tip', {})]
@@ -0,0 +1,40 @@
+from pycoin.blockchain.merkle import (
+    merkle_proof,
+    merkle_root,
+    transaction_hash,
+    verify_merkle_proof,
+)
+
+
+def make_transactions(quantity: int) -> list:
+    return [{
+        'address_sender': 'pum7mQtJqClnNuMIPxCwZSWJkE4=',
+        'recipient_address': 'G7j6UydY3hNM-SzpRxyzIJf1I3M=',
+        'amount': float(amount),
+        'timestamp': '2024-11-26 07:00:00.000000',
+    } for amount in range(1, quantity + 1)]
+
+
+def test_merkle_proof_for_every_transaction():
+    leaves = [transaction_hash(transaction) for transaction in make_transactions(7)]
+    root = merkle_root(leaves)
+
+    for index, leaf in enumerate(leaves):
+        assert verify_merkle_proof(leaf, merkle_proof(leaves, index), root)
+
+
+def test_merkle_proof_rejects_other_transaction():
+    leaves = [transaction_hash(transaction) for transaction in make_transactions(4)]
+    root = merkle_root(leaves)
+
+    assert not verify_merkle_proof(leaves[1], merkle_proof(leaves, 0), root)
+
+
+def test_merkle_root_changes_with_transactions():
+    transactions = make_transactions(3)
+    leaves = [transaction_hash(transaction) for transaction in transactions]
+
+    transactions[2]['amount'] = 999.0
+    tampered = [transaction_hash(transaction) for transaction in transactions]
+
+    assert merkle_root(leaves) != merkle_root(tampered)
@@ -11,7 +11,7 @@ def test_create_genesis_block():
     list_genesis_block = create_genesis_block()
     dict_genesis_block = list_genesis_block[0]
     list_keys = ['index', 'timestamp', 'proof',
-                 'hash', 'previous_hash', 'transactions']
+                 'hash', 'previous_hash', 'merkle_root', 'transactions']
 
     assert all([key in list_keys for key in dict_genesis_block])
 
@@ -19,7 +19,7 @@ def test_create_genesis_block():
 def test_get_previous_block():
     chain = get_previous_block(settings.TEST_BLOCKCHAIN_FILE)
     list_keys = ['index', 'timestamp', 'proof',
-                 'hash', 'previous_hash', 'transactions']
+                 'hash', 'previous_hash', 'merkle_root', 'transactions']
 
     print([key in list_keys for key in chain])
 
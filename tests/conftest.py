@@ -2,10 +2,17 @@ import pytest
 from fastapi.testclient import TestClient
 
 from pycoin.app import app
+from pycoin.blockchain.block_utils import create_block
 from pycoin.blockchain.blockchain_manager import BlockchainInitializer
+from pycoin.blockchain.chain_store import get_chain_store
+from pycoin.miner.mining_utils import search_nonce_range
 from pycoin.settings.config import Settings
+from pycoin.transaction import Transaction
+from pycoin.wallet import Wallet
 
 settings = Settings()
+# Dificuldade usada nas cadeias mineradas pelos testes
+DIFFICULTY = 2
 BlockchainInitializer(
     nodes_file_path=settings.TEST_NODES_FILE,
     block_file_path=settings.TEST_BLOCKCHAIN_FILE,
@@ -17,3 +24,43 @@ BlockchainInitializer(
 def client():
     with TestClient(app) as client:
         yield client
+
+
+def mine_chain(chain: list, length: int, transactions: list = ()) -> list:
+    """
+    Minera blocos (com as transações informadas) até a cadeia ter length blocos.
+    """
+    chain = list(chain)
+    while len(chain) < length:
+        previous_block = chain[-1]
+        chain.append(create_block(
+            index=len(chain),
+            proof=search_nonce_range(previous_block['proof'], DIFFICULTY, 1, 10**6),
+            previous_hash=previous_block['hash'],
+            transactions=list(transactions),
+        ))
+    return chain
+
+
+def make_wallet() -> dict:
+    private_key, public_key, address = Wallet().generate_strings_key_no_markers()
+    return {'private_key': private_key, 'public_key': public_key, 'address': address}
+
+
+@pytest.fixture
+def funded(tmp_path):
+    """
+    Cadeia em tmp_path cuja primeira de três carteiras tem saldo de 100.
+    """
+    wallet_a, wallet_b, wallet_c = make_wallet(), make_wallet(), make_wallet()
+    block_file_path = tmp_path / 'block.json'
+    get_chain_store(block_file_path).replace([{
+        'index': 0, 'hash': 'hash-0', 'timestamp': '2024-01-01 00:00:00',
+        'transactions': [{'address_sender': 'MINING_REWARD',
+                          'recipient_address': wallet_a['address'], 'amount': 100.0}],
+    }])
+
+    transaction = Transaction()
+    transaction.transactions_file_path = tmp_path / 'transactions.json'
+    transaction.block_file_path = block_file_path
+    return transaction, block_file_path, wallet_a, wallet_b, wallet_c
@@ -0,0 +1,146 @@
+import json
+import threading
+
+from pycoin.mempool import Mempool, transaction_id
+
+THREADS = 4
+TRANSACTIONS_PER_THREAD = 200
+
+
+def make_transaction(amount: float) -> dict:
+    return {
+        'address_sender': 'pum7mQtJqClnNuMIPxCwZSWJkE4=',
+        'recipient_address': 'G7j6UydY3hNM-SzpRxyzIJf1I3M=',
+        'amount': amount,
+        'timestamp': '2024-11-26 07:00:00.000000',
+    }
+
+
+def test_mempool_deduplicates_by_id():
+    mempool = Mempool()
+
+    assert mempool.add(make_transaction(1.0))
+    assert not mempool.add(make_transaction(1.0))
+    assert len(mempool) == 1
+    assert transaction_id(make_transaction(1.0)) in mempool
+
+
+def test_mempool_drain_returns_in_arrival_order():
+    mempool = Mempool()
+    mempool.add_many([make_transaction(1.0), make_transaction(2.0)])
+
+    drained = mempool.drain()
+
+    assert [transaction['amount'] for transaction in drained] == [1.0, 2.0]
+    assert len(mempool) == 0
+
+
+def test_mempool_journal_replay(tmp_path):
+    journal_file = tmp_path / 'transactions.journal'
+    mempool = Mempool(journal_file_path=journal_file)
+    added = mempool.add_many([make_transaction(1.0), make_transaction(2.0)])
+    mempool.remove([added[0]['id']])
+
+    with open(journal_file, 'a', encoding='utf-8') as file:
+        file.write('{"op":"add","transac')
+
+    reloaded = Mempool(journal_file_path=journal_file)
+
+    assert reloaded.snapshot() == [added[1]]
+
+
+def test_mempool_imports_legacy_file(tmp_path):
+    legacy_file = tmp_path / 'transactions.json'
+    legacy_file.write_text(json.dumps({'transactions': [make_transaction(3.0)]}),
+                           encoding='utf-8')
+
+    mempool = Mempool(journal_file_path=tmp_path / 'transactions.journal',
+                      legacy_file_path=legacy_file)
+
+    assert len(mempool) == 1
+    assert json.loads(legacy_file.read_text(encoding='utf-8')) == {'transactions': []}
+    assert len(Mempool(journal_file_path=tmp_path / 'transactions.journal',
+                       legacy_file_path=legacy_file)) == 1
+
+
+def test_mempool_rejects_reward_transactions(tmp_path):
+    reward = dict(make_transaction(50.0), address_sender='MINING_REWARD')
+    legacy_file = tmp_path / 'transactions.json'
+    legacy_file.write_text(json.dumps({'transactions': [reward]}), encoding='utf-8')
+
+    mempool = Mempool(journal_file_path=tmp_path / 'transactions.journal',
+                      legacy_file_path=legacy_file)
+
+    assert len(mempool) == 0
+    assert not mempool.add(reward)
+    assert mempool.pending_balance(reward['recipient_address']) == 0
+
+
+def test_mempool_snapshot_commit_removes_only_included():
+    mempool = Mempool()
+    first, second = mempool.add_many([make_transaction(1.0), make_transaction(2.0)])
+
+    with mempool.take_snapshot() as snapshot:
+        # Transação que chega durante a mineração não faz parte do snapshot
+        late = mempool.add_many([make_transaction(3.0)])[0]
+        assert snapshot.tx_ids == [first['id'], second['id']]
+        assert mempool.take_snapshot().tx_ids == [late['id']]
+
+        assert snapshot.commit([first['id']]) == 1
+
+    assert [transaction['id'] for transaction in mempool.snapshot()] == \
+        [second['id'], late['id']]
+    assert mempool.take_snapshot().tx_ids == [second['id']]
+
+
+def test_mempool_snapshot_rolls_back_on_error():
+    mempool = Mempool()
+    added = mempool.add_many([make_transaction(1.0), make_transaction(2.0)])
+
+    try:
+        with mempool.take_snapshot([added[1]['id'], 'desconhecida']) as snapshot:
+            assert snapshot.tx_ids == [added[1]['id']]
+            raise RuntimeError
+    except RuntimeError:
+        pass
+
+    assert len(mempool) == len(added)
+    assert mempool.take_snapshot().tx_ids == [added[0]['id'], added[1]['id']]
+
+
+def test_mempool_snapshot_keeps_concurrent_transactions():
+    mempool = Mempool()
+    committed = []
+
+    def add_transactions(offset: int) -> None:
+        for amount in range(TRANSACTIONS_PER_THREAD):
+            mempool.add(make_transaction(float(offset + amount)))
+
+    threads = [threading.Thread(target=add_transactions, args=(offset * 1000,))
+               for offset in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads) or len(mempool):
+        with mempool.take_snapshot() as snapshot:
+            committed.extend(snapshot.tx_ids)
+            snapshot.commit()
+    for thread in threads:
+        thread.join()
+
+    assert len(committed) == len(set(committed)) == THREADS * TRANSACTIONS_PER_THREAD
+
+
+def test_mempool_journal_is_compacted(tmp_path):
+    journal_file = tmp_path / 'transactions.journal'
+    mempool = Mempool(journal_file_path=journal_file, compact_factor=2, compact_min=4)
+
+    for amount in range(10):
+        assert mempool.add(make_transaction(float(amount)))
+        if amount % 3:
+            mempool.remove([mempool.snapshot()[0]['id']])
+
+    lines = journal_file.read_text(encoding='utf-8').splitlines()
+    records = sum(len(entry.get('transactions', ())) + len(entry.get('ids', ()))
+                  for entry in map(json.loads, lines))
+    assert records <= max(4, 2 * len(mempool))
+    assert Mempool(journal_file_path=journal_file).snapshot() == mempool.snapshot()
@@ -0,0 +1,110 @@
+from pycoin.blockchain.balance_index import BalanceIndex
+from pycoin.blockchain.block_utils import discard_mined_transactions
+from pycoin.blockchain.chain_store import ChainStore, JsonBlockStorage
+from pycoin.mempool import Mempool, get_mempool
+from pycoin.miner.block_template import (
+    BlockTemplateBuilder,
+    template_fees,
+    transaction_size,
+)
+
+ADDRESS_A = 'pum7mQtJqClnNuMIPxCwZSWJkE4='
+ADDRESS_B = 'G7j6UydY3hNM-SzpRxyzIJf1I3M='
+
+
+def transfer(amount: float, fee: float = 0.0, sender: str = ADDRESS_A,
+             recipient: str = ADDRESS_B,
+             timestamp: str = '2024-11-26 07:00:00.000000') -> dict:
+    return {
+        'address_sender': sender,
+        'recipient_address': recipient,
+        'amount': amount,
+        'fee': fee,
+        'timestamp': timestamp,
+    }
+
+
+def make_chain_store(tmp_path, balance: float = 100.0) -> ChainStore:
+    chain_store = ChainStore(block_file_path=tmp_path / 'block.json',
+                             storage=JsonBlockStorage(tmp_path / 'block.json'),
+                             balance_index=BalanceIndex())
+    chain_store.replace([{
+        'index': 0,
+        'hash': 'hash-0',
+        'transactions': [transfer(balance, sender='MINING_REWARD', recipient=ADDRESS_A)],
+    }])
+    return chain_store
+
+
+def test_block_template_orders_by_fee_and_arrival(tmp_path):
+    mempool = Mempool()
+    transactions = mempool.add_many(
+        [transfer(1.0, fee=0.1), transfer(2.0, fee=0.5), transfer(3.0, fee=0.1)])
+    builder = BlockTemplateBuilder(mempool, make_chain_store(tmp_path))
+
+    template = builder.get_template()
+
+    assert [transaction['amount'] for transaction in template] == [2.0, 1.0, 3.0]
+    assert template_fees(template) == template_fees(transactions)
+
+
+def test_block_template_respects_limits(tmp_path):
+    mempool = Mempool()
+    transactions = mempool.add_many([transfer(float(amount)) for amount in range(1, 6)])
+    size = transaction_size(transactions[0])
+
+    count_limit, size_limit = 2, 3
+    by_count = BlockTemplateBuilder(mempool, make_chain_store(tmp_path),
+                                    max_transactions=count_limit)
+    by_bytes = BlockTemplateBuilder(mempool, make_chain_store(tmp_path),
+                                    max_bytes=size * size_limit)
+
+    assert len(by_count.get_template()) == count_limit
+    assert len(by_bytes.get_template()) == size_limit
+
+
+def test_block_template_drops_overspending_transactions(tmp_path):
+    mempool = Mempool()
+    mempool.add_many([transfer(60.0, fee=1.0), transfer(50.0, fee=2.0), transfer(30.0)])
+    builder = BlockTemplateBuilder(mempool, make_chain_store(tmp_path))
+
+    # 50 + 2 é escolhida primeiro; 60 + 1 ultrapassaria o saldo de 100
+    amounts = [transaction['amount'] for transaction in builder.get_template()]
+    assert amounts == [50.0, 30.0]
+
+
+def test_block_template_follows_mempool(tmp_path):
+    mempool = Mempool()
+    builder = BlockTemplateBuilder(mempool, make_chain_store(tmp_path),
+                                   max_transactions=2)
+    assert builder.get_template() == []
+
+    first, second = mempool.add_many([transfer(1.0), transfer(2.0)])
+    assert [transaction['id'] for transaction in builder.get_template()] == \
+        [first['id'], second['id']]
+
+    # Uma transação de maior taxa que não cabe substitui a de menor prioridade
+    third = mempool.add_many([transfer(3.0, fee=1.0)])[0]
+    assert [transaction['id'] for transaction in builder.get_template()] == \
+        [third['id'], first['id']]
+
+    mempool.remove([third['id']])
+    assert [transaction['id'] for transaction in builder.get_template()] == \
+        [first['id'], second['id']]
+
+    mempool.clear()
+    assert builder.get_template() == []
+
+
+def test_mined_transactions_are_identified_by_content(tmp_path):
+    transactions_file_path = tmp_path / 'transactions.json'
+    mempool = get_mempool(transactions_file_path)
+    victim, mined = mempool.add_many([transfer(1.0), transfer(2.0)])
+
+    # Um nó malicioso copia o id da transação pendente em outra transação
+    forged = dict(transfer(0.1), id=victim['id'])
+    block = {'transactions': [forged, mined]}
+
+    assert discard_mined_transactions([block], transactions_file_path) == 1
+    assert victim['id'] in mempool
+    assert mined['id'] not in mempool
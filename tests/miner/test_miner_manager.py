@@ -0,0 +1,34 @@
+import asyncio
+
+from pycoin.miner.miner_manager import MinerManager
+from pycoin.miner.mining_utils import chain_tip_signal
+
+
+def run_round(result, capsys) -> str:
+    """
+    Executa uma única rodada de mineração que muda a ponta da cadeia.
+    """
+    manager = MinerManager(pause=0)
+
+    async def mine_function():
+        manager.is_mining = False
+        chain_tip_signal.notify()
+        return result
+
+    manager.is_mining = True
+    asyncio.run(manager._mining_loop(mine_function))
+    return capsys.readouterr().out
+
+
+def test_own_mined_block_is_not_treated_as_stale(capsys):
+    output = run_round({'new_block': 'new_block'}, capsys)
+
+    assert 'Nova ponta da cadeia' not in output
+    assert 'Retomando Mineração' in output
+
+
+def test_aborted_round_restarts_on_new_tip(capsys):
+    output = run_round(False, capsys)
+
+    assert 'Nova ponta da cadeia' in output
+    assert 'Retomando Mineração' not in output
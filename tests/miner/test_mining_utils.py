@@ -0,0 +1,47 @@
+import asyncio
+
+from pycoin.miner.mining_utils import (
+    ProofOfWorkEngine,
+    chain_tip_signal,
+    is_valid_proof,
+    search_nonce_range,
+)
+
+
+def test_search_nonce_range_finds_first_valid_proof():
+    proof = search_nonce_range(previous_proof=100, difficulty=3, start=1, end=100_000)
+
+    assert proof is not None
+    assert is_valid_proof(new_proof=proof, previous_proof=100, difficulty=3)
+    assert not any(is_valid_proof(nonce, 100, 3) for nonce in range(1, proof))
+
+
+def test_search_nonce_range_without_proof():
+    assert search_nonce_range(previous_proof=100, difficulty=3, start=1, end=2) is None
+
+
+def test_engine_search_returns_valid_proof():
+    engine = ProofOfWorkEngine(workers=2, chunk_size=5_000)
+    try:
+        proof = asyncio.run(engine.search(previous_proof=100, difficulty=4))
+    finally:
+        engine.shutdown()
+
+    assert is_valid_proof(new_proof=proof, previous_proof=100, difficulty=4)
+
+
+def test_engine_search_aborts_when_chain_tip_changes():
+    engine = ProofOfWorkEngine(workers=2, chunk_size=5_000)
+
+    async def search_and_replace_tip():
+        generation = chain_tip_signal.generation
+        search = asyncio.create_task(
+            engine.search(previous_proof=100, difficulty=64, generation=generation))
+        await asyncio.sleep(0.2)
+        chain_tip_signal.notify()
+        return await asyncio.wait_for(search, timeout=2)
+
+    try:
+        assert asyncio.run(search_and_replace_tip()) is None
+    finally:
+        engine.shutdown()
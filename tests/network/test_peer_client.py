@@ -0,0 +1,68 @@
+import asyncio
+
+import httpx
+
+from pycoin.network.peer_client import PeerClient, close_peer_client, get_peer_client
+
+
+def make_client(handler, **kwargs) -> PeerClient:
+    return PeerClient(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_ping_many_reports_online_and_offline_nodes():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == 'offline':
+            raise httpx.ConnectError('recusado', request=request)
+        return httpx.Response(200, json={'message': 'pong'})
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.ping_many(['online:8000', 'offline:8000'])
+
+    assert asyncio.run(run()) == {'online:8000': True, 'offline:8000': False}
+
+
+def test_request_returns_none_on_error_status():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500)
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.get('node:8000', '/miner/get_chain')
+
+    assert asyncio.run(run()) is None
+
+
+def test_concurrency_is_bounded():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200)
+
+    max_concurrency = 3
+
+    async def run():
+        async with make_client(handler, max_concurrency=max_concurrency) as client:
+            nodes = [f'node{i}:8000' for i in range(10)]
+            return await client.get_many(nodes, '/ping')
+
+    responses = asyncio.run(run())
+
+    assert all(response is not None for response in responses.values())
+    assert max_in_flight == max_concurrency
+
+
+def test_peer_client_is_reused_within_loop():
+    async def run():
+        try:
+            return get_peer_client() is get_peer_client()
+        finally:
+            await close_peer_client()
+
+    assert asyncio.run(run())
@@ -0,0 +1,68 @@
+import asyncio
+
+import httpx
+
+from pycoin.network.peer_client import PeerClient
+from pycoin.network.peer_manager import PeerManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_manager(handler, nodes: list, clock) -> PeerManager:
+    client = PeerClient(transport=httpx.MockTransport(handler))
+    return PeerManager(load_nodes=lambda: nodes, client=client, refresh_interval=10,
+                       max_backoff=40, clock=clock)
+
+
+def test_unchecked_peers_are_live_until_they_fail():
+    manager = PeerManager(load_nodes=lambda: ['a:8000', 'me:8000'])
+    manager.my_node = 'me:8000'
+
+    assert manager.live_peers() == ['a:8000']
+
+
+def test_refresh_backs_off_failing_peers():
+    pings = []
+    clock = FakeClock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        pings.append(request.url.host)
+        if request.url.host == 'dead':
+            raise httpx.ConnectError('recusado', request=request)
+        return httpx.Response(200)
+
+    manager = make_manager(handler, ['alive:8000', 'dead:8000'], clock)
+
+    async def refresh_at(*instants):
+        for instant in instants:
+            clock.now = instant
+            await manager.refresh()
+
+    # Falhas em 0, 10, 30 e 70: a espera dobra (10, 20, 40) e fica limitada em 40
+    failures = (0, 10, 30, 70)
+    # O nó online é reconsultado a cada refresh_interval
+    alive_checks = (0, 10, 20, 30, 60, 70)
+    asyncio.run(refresh_at(0, 5, 10, 20, 30, 60, 70))
+
+    assert manager.live_peers() == ['alive:8000']
+    assert pings.count('dead') == len(failures)
+    assert manager.status('dead:8000').failures == len(failures)
+    assert manager.status('dead:8000').next_check == failures[-1] + manager.max_backoff
+    assert pings.count('alive') == len(alive_checks)
+
+
+def test_success_resets_failures():
+    clock = FakeClock()
+    manager = PeerManager(load_nodes=lambda: ['a:8000'], clock=clock)
+    manager.record_failure('a:8000')
+    manager.record_failure('a:8000')
+    manager.record_success('a:8000', latency=0.01)
+
+    assert manager.status('a:8000').failures == 0
+    assert manager.live_peers() == ['a:8000']
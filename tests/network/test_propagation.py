@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import httpx
+
+from pycoin.network.peer_client import PeerClient
+from pycoin.network.propagation import BlockPropagator
+
+
+def test_announce_coalesces_superseded_payloads():
+    received = []
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await gate.wait()
+            received.append(json.loads(request.content)['height'])
+            return httpx.Response(200)
+
+        async with PeerClient(transport=httpx.MockTransport(handler)) as client:
+            propagator = BlockPropagator(client=client)
+            for height in range(5):
+                propagator.announce('/miner/new_block', {'height': height}, ['node:8000'])
+                await asyncio.sleep(0)
+            gate.set()
+            await propagator.wait_idle()
+
+    asyncio.run(run())
+
+    # O primeiro anúncio já estava em envio; os intermediários foram substituídos
+    assert received == [0, 4]
+
+
+def test_slow_peer_does_not_delay_others():
+    delivered = []
+
+    async def run():
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == 'slow':
+                await asyncio.sleep(10)
+            delivered.append(request.url.host)
+            return httpx.Response(200)
+
+        async with PeerClient(transport=httpx.MockTransport(handler)) as client:
+            propagator = BlockPropagator(client=client)
+            propagator.announce('/miner/new_block', {}, ['slow:8000', 'fast:8000'])
+            await asyncio.sleep(0.1)
+            pending = propagator.pending_nodes()
+            await propagator.close()
+            return pending
+
+    pending = asyncio.run(run())
+
+    assert delivered == ['fast']
+    assert pending == ['slow:8000']
@@ -0,0 +1,41 @@
+from pycoin.network.seen_cache import SeenCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_add_reports_duplicates():
+    cache = SeenCache(max_size=10, ttl=60)
+
+    assert cache.add('a')
+    assert not cache.add('a')
+    assert 'a' in cache
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = SeenCache(max_size=10, ttl=60, clock=clock)
+    cache.add('a')
+
+    clock.now = 59
+    assert 'a' in cache
+    clock.now = 60
+    assert 'a' not in cache
+    assert cache.add('a')
+
+
+def test_oldest_entries_are_evicted_when_full():
+    max_size = 2
+    cache = SeenCache(max_size=max_size, ttl=60)
+    for key in ('a', 'b', 'c'):
+        cache.add(key)
+
+    assert 'a' not in cache
+    assert 'b' in cache
+    assert 'c' in cache
+    assert len(cache) == max_size
@@ -1,4 +1,80 @@
+import json
+from http import HTTPStatus
+
+from pycoin.network.seen_cache import seen_blocks
+from pycoin.routers import miner
 
 
 def test_connect_node():
     pass
+
+
+def test_transaction_proof_not_found(client):
+    response = client.get('miner/transaction_proof',
+                          params={'block_index': 10**6, 'transaction_hash': '0' * 64})
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_headers_are_limited_to_page_size(client):
+    tip = client.get('miner/tip').json()
+    response = client.get('miner/headers', params={'from_height': 0, 'limit': 10**6})
+
+    assert response.status_code == HTTPStatus.OK
+    headers = response.json()['headers']
+    assert headers[-1]['hash'] == tip['hash']
+    assert 'transactions' not in headers[0]
+
+
+def test_new_block_duplicate_is_dropped_before_parsing_body(client):
+    seen_blocks.add('f' * 64)
+
+    response = client.post('miner/new_block', content=b'corpo que nao e json',
+                           headers={'X-Block-Hash': 'f' * 64})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['status'] == 'known'
+
+
+def test_get_chain_paginated_and_streamed(client):
+    full = client.get('miner/get_chain').json()
+    page = client.get('miner/get_chain', params={'from_height': 0, 'limit': 1}).json()
+
+    assert page['length'] == full['length']
+    assert page['chain'] == full['chain'][:1]
+
+    response = client.get('miner/get_chain', params={'stream': True})
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    blocks = [json.loads(line) for line in response.text.splitlines()]
+    assert blocks == full['chain']
+
+
+def test_new_block_with_mismatched_hash_is_not_remembered(client):
+    response = client.post('miner/new_block',
+                           json={'block': {'hash': 'b' * 64}, 'sender': '127.0.0.1:8001'},
+                           headers={'X-Block-Hash': 'a' * 64})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'a' * 64 not in seen_blocks
+
+
+def test_new_block_with_malformed_body_is_rejected(client):
+    for body in ({'block': {'hash': 'd' * 64}}, {'block': [], 'sender': 'a:8000'}):
+        response = client.post('miner/new_block', json=body)
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'd' * 64 not in seen_blocks
+
+
+def test_new_block_failed_sync_is_not_remembered(client, monkeypatch):
+
+    async def failed_sync(block, sender):
+        return 'ignored'
+
+    monkeypatch.setattr(miner, 'receive_new_block', failed_sync)
+    response = client.post('miner/new_block',
+                           json={'block': {'hash': 'c' * 64}, 'sender': '127.0.0.1:8001'},
+                           headers={'X-Block-Hash': 'c' * 64})
+
+    assert response.json()['status'] == 'ignored'
+    assert 'c' * 64 not in seen_blocks
@@ -1,6 +1,8 @@
+import asyncio
 import json
 from pathlib import Path
 
+from pycoin.blockchain.blockchain_manager import BlockchainInitializer
 from pycoin.settings.config import Settings
 from pycoin.utils.file_initializers import (
     initialize_blockchain_file,
@@ -27,7 +29,7 @@ def test_initialize_blockchain_file():
         blockchain = json.load(file)
 
     list_keys = ['index', 'timestamp', 'proof',
-                 'hash', 'previous_hash', 'transactions']
+                 'hash', 'previous_hash', 'merkle_root', 'transactions']
 
     assert all([key in list_keys for key in blockchain[0]]), "O arquivo deve conter um bloco gênesis após a inicialização."
 
@@ -86,3 +88,16 @@ def test_initialize_transaction_file():
 
     if test_file.exists():
         test_file.unlink()
+
+
+def test_initializer_runs_inside_event_loop(tmp_path):
+    async def initialize():
+        # O uvicorn importa a aplicação com o event loop já rodando
+        return BlockchainInitializer(
+            nodes_file_path=tmp_path / 'nodes.json',
+            block_file_path=tmp_path / 'block.json',
+            transaction_file_path=tmp_path / 'transactions.json',
+        )
+
+    assert asyncio.run(initialize()).is_blockchain_created
+    assert not asyncio.run(initialize()).is_blockchain_created
@@ -0,0 +1,58 @@
+import pytest
+
+from pycoin.signature_verifier import SignatureVerifier, verify_transaction_signature
+
+
+@pytest.fixture
+def signed_transactions(funded):
+    transaction, block_file_path, sender, recipient, _ = funded
+    return transaction.add_transactions([{
+        'private_key_sender': sender['private_key'],
+        'public_key_sender': sender['public_key'],
+        'recipient_address': recipient['address'],
+        'amount': amount,
+        'fee': fee,
+    } for amount, fee in ((1, 0.0), (2.5, 0.5), (3, 0.0))],
+        block_file_path=block_file_path)
+
+
+def test_transactions_carry_verifiable_signature(signed_transactions):
+    assert all(verify_transaction_signature(tx) for tx in signed_transactions)
+
+    tampered = dict(signed_transactions[0], amount=99.0)
+    assert not verify_transaction_signature(tampered)
+
+    # A taxa e o timestamp fazem parte dos dados assinados
+    assert not verify_transaction_signature(dict(signed_transactions[1], fee=0.0))
+    replayed = dict(signed_transactions[0], timestamp='2030-01-01 00:00:00.000000')
+    assert not verify_transaction_signature(replayed)
+
+    unsigned = {key: value for key, value in signed_transactions[0].items()
+                if key != 'signature'}
+    assert not verify_transaction_signature(unsigned)
+
+
+def test_malformed_transactions_are_invalid(signed_transactions):
+    invalid_key = {key: value for key, value in signed_transactions[0].items()
+                   if key != 'address_sender'}
+    invalid_key['public_key'] = 'chave-invalida'
+
+    assert not verify_transaction_signature(invalid_key)
+    assert not verify_transaction_signature(dict(invalid_key, public_key=['lista']))
+    assert not verify_transaction_signature('transação')
+    assert not SignatureVerifier(workers=1).verify_many(['transação'])
+
+
+def test_verifier_uses_pool_and_caches_ids(signed_transactions):
+    verifier = SignatureVerifier(workers=2, min_parallel=2)
+    try:
+        assert verifier.verify_many(signed_transactions)
+    finally:
+        verifier.shutdown()
+
+    assert all(verifier.is_verified(tx['id']) for tx in signed_transactions)
+
+    forged = dict(signed_transactions[1],
+                  recipient_address=signed_transactions[0]['address_sender'])
+    assert not verifier.verify_many([forged])
+    assert verifier.verify_many([{'address_sender': 'MINING_REWARD', 'amount': 50.0}])
@@ -0,0 +1,42 @@
+import pytest
+
+from pycoin.exceptions.transaction_exceptions import TransactionError
+from pycoin.mempool import get_mempool
+from pycoin.transaction import Transaction
+
+
+def transfer(sender: dict, recipient: dict, amount: float) -> dict:
+    return {
+        'private_key_sender': sender['private_key'],
+        'public_key_sender': sender['public_key'],
+        'recipient_address': recipient['address'],
+        'amount': amount,
+    }
+
+
+def test_batch_is_added_with_running_balances(funded):
+    transaction, block_file_path, wallet_a, wallet_b, wallet_c = funded
+
+    transfers = [transfer(wallet_a, wallet_b, 30.0), transfer(wallet_a, wallet_b, 30.0),
+                 transfer(wallet_b, wallet_c, 20.0)]
+    added = transaction.add_transactions(transfers, block_file_path=block_file_path)
+
+    assert len(added) == len(transfers)
+    assert len(get_mempool(transaction.transactions_file_path)) == len(transfers)
+    # O saldo inicial de 100 menos as duas transferências de 30
+    assert Transaction.get_wallet_balance(
+        wallet_a['address'], block_file_path,
+        transaction.transactions_file_path) == 100.0 - 30.0 - 30.0
+
+
+def test_batch_overspend_rejects_whole_batch(funded):
+    transaction, block_file_path, wallet_a, wallet_b, _ = funded
+
+    with pytest.raises(TransactionError) as error:
+        transaction.add_transactions(
+            [transfer(wallet_a, wallet_b, 60.0), transfer(wallet_a, wallet_b, 60.0)],
+            block_file_path=block_file_path)
+
+    assert error.value.detail == \
+        'Transação 1: Saldo insuficiente para realizar a transação.'
+    assert len(get_mempool(transaction.transactions_file_path)) == 0
@@ -1,10 +1,13 @@
 import datetime
+import json
 from http import HTTPStatus
 
 import pytest
 
+from pycoin import transaction as transaction_module
 from pycoin.settings.config import Settings
 from pycoin.transaction import Transaction
+from pycoin.wallet import Wallet, generate_wallets
 
 settings = Settings()
 
@@ -178,3 +181,67 @@ def test_validate_address(client):
                                      private_key=wallet_A["private_key"],
                                      recipient_address="BYXVAtULLifhYEscI_AExqSxQIk=",
                                      amount=999.0)
+
+
+def test_parsed_keys_and_address_are_cached():
+    private_key, public_key, address = Wallet().generate_strings_key_no_markers()
+
+    assert Wallet.load_public_key_from_string(public_key) \
+        is Wallet.load_public_key_from_string(public_key)
+    assert Wallet.load_private_key_from_string(private_key) \
+        is Wallet.load_private_key_from_string(private_key)
+    assert Wallet.address_from_public_key_string(public_key) == address
+
+
+def test_matching_key_pair_compares_public_points():
+    private_a, public_a, _ = Wallet().generate_strings_key_no_markers()
+    _, public_b, _ = Wallet().generate_strings_key_no_markers()
+
+    assert Wallet.is_matching_key_pair(private_a, public_a)
+    assert not Wallet.is_matching_key_pair(private_a, public_b)
+    assert not Wallet.is_matching_key_pair(private_a, 'chave-invalida')
+
+
+@pytest.mark.parametrize('is_fast', [True, False])
+def test_signing_modes_produce_valid_signature(client, monkeypatch, is_fast):
+    monkeypatch.setattr(transaction_module.settings, 'TRANSACTION_FAST_SIGNING',
+                        is_fast)
+    wallet_A = generate_wallet_in_json(client)
+    wallet_B = generate_wallet_in_json(client)
+
+    transaction = Transaction()
+    assert transaction.sign_transaction(public_key=wallet_A["public_key"],
+                                        private_key=wallet_A["private_key"],
+                                        recipient_address=wallet_B["address"],
+                                        amount=10.0)
+    assert transaction.verify_signature(
+        Wallet.load_public_key_from_string(wallet_A["public_key"]),
+        wallet_B["address"], 10.0)
+
+    with pytest.raises(ValueError,
+                       match="Chave privada e chave pública não correspondem."):
+        transaction.sign_transaction(public_key=wallet_B["public_key"],
+                                     private_key=wallet_A["private_key"],
+                                     recipient_address=wallet_B["address"],
+                                     amount=10.0)
+
+
+def test_generate_wallets_in_parallel():
+    count = 7
+    wallets = list(generate_wallets(count, workers=2, chunk_size=2))
+
+    assert len(wallets) == count
+    assert len({wallet['address'] for wallet in wallets}) == count
+    for wallet in wallets:
+        address = Wallet.address_from_public_key_string(wallet['public_key'])
+        assert address == wallet['address']
+        assert Wallet.is_matching_key_pair(wallet['private_key'], wallet['public_key'])
+
+
+def test_generate_wallets_endpoint_streams_ndjson(client):
+    count = 3
+    response = client.get("wallet/generate_wallets", params={'count': count})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert len([json.loads(line) for line in response.text.splitlines()]) == count
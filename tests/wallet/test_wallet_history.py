@@ -0,0 +1,47 @@
+from pycoin.blockchain.chain_store import get_chain_store
+from pycoin.transaction import Transaction
+
+ADDRESS_A = 'pum7mQtJqClnNuMIPxCwZSWJkE4='
+ADDRESS_B = 'G7j6UydY3hNM-SzpRxyzIJf1I3M='
+# Valor da última transação recebida por ADDRESS_A, visto pelo remetente
+LAST_SENT_AMOUNT = -7.0
+
+
+def make_chain(length: int) -> list:
+    chain = [{'index': 0, 'hash': 'hash-0', 'timestamp': '2024-01-01 00:00:00',
+              'transactions': []}]
+    for height in range(1, length):
+        chain.append({
+            'index': height,
+            'hash': f'hash-{height}',
+            'timestamp': f'2024-01-{height + 1:02d} 00:00:00',
+            'transactions': [{'address_sender': ADDRESS_B,
+                              'recipient_address': ADDRESS_A,
+                              'amount': float(height)}],
+        })
+    return chain
+
+
+def test_wallet_history_pages_newest_first(tmp_path):
+    transaction = Transaction()
+    transaction.block_file_path = tmp_path / 'block.json'
+    transaction.transactions_file_path = tmp_path / 'transactions.json'
+    get_chain_store(transaction.block_file_path).replace(make_chain(8))
+
+    def history(**kwargs):
+        return transaction.get_wallet_history(wallet_address=ADDRESS_A, **kwargs)
+
+    first_page = history(limit=3)
+    second_page = history(limit=3, cursor=first_page['next_cursor'])
+
+    assert first_page['balance'] == sum(range(1, 8))
+    assert [tx['block_index'] for tx in first_page['transactions']] == [7, 6, 5]
+    assert [tx['block_index'] for tx in second_page['transactions']] == [4, 3, 2]
+
+    # Para o remetente o valor aparece negativo
+    page_b = transaction.get_wallet_history(wallet_address=ADDRESS_B, limit=1)
+    assert page_b['transactions'][0]['amount'] == LAST_SENT_AMOUNT
+
+    in_range = history(limit=10, start_time='2024-01-03', end_time='2024-01-05 00:00:00')
+    assert [tx['block_index'] for tx in in_range['transactions']] == [4, 3, 2]
+    assert in_range['next_cursor'] is None